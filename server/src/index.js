@@ -1,31 +1,6 @@
-// Load environment variables FIRST - before any imports
-import dotenv from 'dotenv';
-import { fileURLToPath } from 'url';
-import { dirname, join } from 'path';
-
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = dirname(__filename);
-
-// Load .env from server root directory
-const envPath = join(__dirname, '..', '.env');
-console.log('🔍 Loading .env from:', envPath);
-
-const result = dotenv.config({ path: envPath });
-
-if (result.error) {
-  console.error('❌ Error loading .env file:', result.error);
-} else {
-  console.log('✅ .env file loaded successfully');
-}
-
-// Debug environment variables
-console.log('🔍 Environment variables check:');
-console.log('GEMINI_API_KEY exists:', !!process.env.GEMINI_API_KEY);
-console.log('GOOGLE_API_KEY exists:', !!process.env.GOOGLE_API_KEY);
-console.log('QDRANT_URL exists:', !!process.env.QDRANT_URL);
-console.log('QDRANT_API_KEY exists:', !!process.env.QDRANT_API_KEY);
+// Load environment variables FIRST - before any other module is evaluated
+import { envPath, envResult } from './utils/loadEnv.js';
 
-// Now import other modules AFTER environment is loaded
 import express from 'express';
 import cors from 'cors';
 import helmet from 'helmet';
@@ -35,24 +10,55 @@ import { Server } from 'socket.io';
 import multer from 'multer';
 import path from 'path';
 import fs from 'fs';
+import { fileURLToPath } from 'url';
 
 // Import utilities
 import logger from './utils/logger.js';
 import { createDatabase } from './database/database.js';
 
+// Import shared service singletons
+import embeddingService from './services/embeddingService.js';
+import qdrantService from './services/qdrantService.js';
+import ragService from './services/ragService.js';
+
 // Import routes
 import documentRoutes from './routes/documents.js';
 import analysisRoutes from './routes/analysis.js';
 import chatRoutes from './routes/chat.js';
 import voiceRoutes from './routes/voice.js';
 
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+
+logger.info(`🔍 Loading .env from: ${envPath}`);
+
+if (envResult.error) {
+  logger.error('❌ Error loading .env file:', envResult.error);
+} else {
+  logger.info('✅ .env file loaded successfully');
+}
+
+// Debug environment variables
+logger.debug('🔍 Environment variables check', {
+  geminiApiKey: !!process.env.GEMINI_API_KEY,
+  googleApiKey: !!process.env.GOOGLE_API_KEY,
+  qdrantUrl: !!process.env.QDRANT_URL,
+  qdrantApiKey: !!process.env.QDRANT_API_KEY,
+});
+
 const app = express();
 const server = createServer(app);
 
+const CORS_ORIGIN = "http://localhost:8080"; // Frontend is running on port 8080
+
+// Keep client connections alive across requests instead of re-handshaking;
+// headersTimeout must exceed keepAliveTimeout to avoid races on reused sockets
+server.keepAliveTimeout = parseInt(process.env.KEEP_ALIVE_TIMEOUT_MS) || 65 * 1000;
+server.headersTimeout = server.keepAliveTimeout + 1000;
+
 // Initialize Socket.IO
 const io = new Server(server, {
   cors: {
-    origin: "http://localhost:8080", // Frontend is running on port 8080
+    origin: CORS_ORIGIN,
     methods: ["GET", "POST"]
   }
 });
@@ -73,9 +79,12 @@ app.use(helmet({
   },
 }));
 
+// Single fixed origin: no per-request origin matching, and browsers may cache
+// preflight results for 10 minutes instead of sending OPTIONS before each call
 app.use(cors({
-  origin: "http://localhost:8080", // Frontend is running on port 8080
-  credentials: true
+  origin: CORS_ORIGIN,
+  credentials: true,
+  maxAge: 600
 }));
 
 // Rate limiting
@@ -85,28 +94,41 @@ const limiter = rateLimit({
   message: 'Too many requests from this IP, please try again later.',
   standardHeaders: true,
   legacyHeaders: false,
+  // Load balancer probes hit /health constantly; don't spend a store update
+  // on them or let them use up the prober's quota
+  skip: (req) => req.path === '/health',
 });
 
 app.use(limiter);
 app.use(express.json({ limit: '50mb' }));
 app.use(express.urlencoded({ extended: true, limit: '50mb' }));
 
-// Ensure uploads directory exists
-const uploadsDir = path.join(__dirname, 'uploads');
+// Ensure uploads directory exists. This is server/uploads, where the
+// document processor (relative to the server's working directory) and the
+// speech service write the files their /uploads URLs point at
+const uploadsDir = path.join(__dirname, '..', 'uploads');
 if (!fs.existsSync(uploadsDir)) {
   fs.mkdirSync(uploadsDir, { recursive: true });
 }
 
-// Static file serving
-app.use('/uploads', express.static(uploadsDir));
+// Static file serving. Uploaded and generated files get unique (uuid-based)
+// names and are never rewritten, so clients may cache them without
+// revalidating. They are users' documents and recordings, so only the
+// client's own cache may keep them, never a shared proxy or CDN
+app.use('/uploads', express.static(uploadsDir, {
+  cacheControl: false,
+  setHeaders: (res) => {
+    res.setHeader('Cache-Control', 'private, max-age=86400, immutable');
+  }
+}));
+
+// Health check endpoint - hit constantly by load balancers, so the body is
+// pre-built and only the timestamp is filled in per request
+const healthBodyPrefix = '{"status":"ok","timestamp":"';
+const healthBodySuffix = `","environment":${JSON.stringify(process.env.NODE_ENV || 'development')}}`;
 
-// Health check endpoint
 app.get('/health', (req, res) => {
-  res.json({ 
-    status: 'ok', 
-    timestamp: new Date().toISOString(),
-    environment: process.env.NODE_ENV || 'development'
-  });
+  res.type('json').send(healthBodyPrefix + new Date().toISOString() + healthBodySuffix);
 });
 
 // Routes
@@ -134,12 +156,15 @@ app.use((err, req, res, next) => {
   });
 });
 
-// 404 handler
+// 404 handler - the body never varies, so it is serialized once (scanners
+// probing random paths make this a busier route than it looks)
+const notFoundBody = JSON.stringify({
+  error: 'Not found',
+  message: 'The requested resource was not found'
+});
+
 app.use('*', (req, res) => {
-  res.status(404).json({
-    error: 'Not found',
-    message: 'The requested resource was not found'
-  });
+  res.status(404).type('json').send(notFoundBody);
 });
 
 // Socket.IO connection handling - SIMPLIFIED
@@ -176,28 +201,20 @@ async function initializeServices() {
       logger.warn('⚠️  GEMINI_API_KEY not found, RAG features may be limited');
     }
     
-    // Import and initialize embedding service
-    try {
-      const embeddingService = await import('./services/embeddingService.js');
-      await embeddingService.default.initialize();
-    } catch (error) {
-      logger.warn('⚠️  Embedding service initialization failed:', error.message);
-    }
-    
-    // Import and initialize other services
-    try {
-      const qdrantService = await import('./services/qdrantService.js');
-      await qdrantService.default.initialize();
-    } catch (error) {
-      logger.warn('⚠️  Qdrant service initialization failed:', error.message);
-    }
-    
-    try {
-      const ragService = await import('./services/ragService.js');
-      await ragService.default.initialize();
-    } catch (error) {
-      logger.warn('⚠️  RAG service initialization failed:', error.message);
-    }
+    // The RAG services don't depend on each other, and Qdrant's connection
+    // probe can retry for a while, so bring them up concurrently
+    const ragServices = [
+      ['Embedding', embeddingService],
+      ['Qdrant', qdrantService],
+      ['RAG', ragService]
+    ];
+    await Promise.all(ragServices.map(async ([name, service]) => {
+      try {
+        await service.initialize();
+      } catch (error) {
+        logger.warn(`⚠️  ${name} service initialization failed:`, error.message);
+      }
+    }));
     
     logger.info('🚀 RAG services initialization complete');
     
@@ -246,7 +263,7 @@ async function startServer() {
     server.listen(PORT, () => {
       logger.info(`🚀 Server running on port ${PORT}`);
       logger.info(`📁 Environment: ${process.env.NODE_ENV || 'development'}`);
-      logger.info(`🌐 CORS origin: http://localhost:8080`);
+      logger.info(`🌐 CORS origin: ${CORS_ORIGIN}`);
       logger.info(`✅ Socket.IO handlers setup complete`);
     });
     
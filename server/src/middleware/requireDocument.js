@@ -0,0 +1,23 @@
+import databaseService from "../services/databaseService.js";
+
+// Looks up the :documentId document once per request and exposes it as
+// req.document, so route handlers (and anything after this middleware) don't
+// repeat the lookup. Responds 404 when the document doesn't exist. Goes
+// after handleValidation, so :documentId is already known to be valid.
+export async function requireDocument(req, res, next) {
+  try {
+    const { documentId } = req.params;
+    const document = await databaseService.getDocument(documentId);
+    if (!document) {
+      return res.status(404).json({
+        error: "Document not found",
+        message: `No document found with ID: ${documentId}`,
+      });
+    }
+
+    req.document = document;
+    next();
+  } catch (error) {
+    next(error);
+  }
+}
@@ -0,0 +1,14 @@
+import { validationResult } from "express-validator";
+
+// Runs after a route's express-validator chains and answers 400 with the
+// collected errors, so handlers only see requests that passed validation
+export function handleValidation(req, res, next) {
+  const errors = validationResult(req);
+  if (!errors.isEmpty()) {
+    return res.status(400).json({
+      error: "Validation failed",
+      details: errors.array(),
+    });
+  }
+  next();
+}
@@ -1,8 +1,9 @@
 
 
 import express from 'express';
-import { body, param, query, validationResult } from 'express-validator';
-import winston from 'winston';
+import { body, param, query } from 'express-validator';
+import { handleValidation } from '../middleware/validation.js';
+import rootLogger from '../utils/logger.js';
 
 import { analyzeDocument } from '../services/aiAnalyzer.js';
 import { 
@@ -13,11 +14,7 @@ import {
 import { voiceQuerySystem } from '../services/voiceService.js';
 
 const router = express.Router();
-const logger = winston.createLogger({
-  level: 'info',
-  format: winston.format.json(),
-  defaultMeta: { service: 'analysis-api' }
-});
+const logger = rootLogger.child({ module: 'analysis-api' });
 
 // POST /api/analysis/:documentId/analyze - Analyze document
 router.post('/:documentId/analyze',
@@ -28,16 +25,9 @@ router.post('/:documentId/analyze',
     body('options.generatePlainLanguage').optional().isBoolean(),
     body('options.extractInsights').optional().isBoolean(),
   ],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: 'Validation failed',
-          details: errors.array()
-        });
-      }
-
       const { documentId } = req.params;
       const { text, options = {} } = req.body;
       const io = req.app.get('io');
@@ -118,16 +108,9 @@ router.post('/:documentId/analyze',
 // GET /api/analysis/:documentId - Get analysis results
 router.get('/:documentId',
   [param('documentId').isUUID().withMessage('Invalid document ID')],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: 'Validation failed',
-          details: errors.array()
-        });
-      }
-
       const { documentId } = req.params;
       const analysis = await getDocumentAnalysis(documentId);
 
@@ -166,16 +149,9 @@ router.post('/:documentId/query',
     body('query').isString().isLength({ min: 3 }).withMessage('Query is required (minimum 3 characters)'),
     body('sessionId').optional().isString(),
   ],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: 'Validation failed',
-          details: errors.array()
-        });
-      }
-
       const { documentId } = req.params;
       const { query, sessionId = `session-${Date.now()}` } = req.body;
 
@@ -222,16 +198,9 @@ router.get('/:documentId/clauses',
     query('type').optional().isString(),
     query('riskLevel').optional().isIn(['critical', 'high', 'medium', 'low']),
   ],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: 'Validation failed',
-          details: errors.array()
-        });
-      }
-
       const { documentId } = req.params;
       const { type, riskLevel } = req.query;
 
@@ -287,16 +256,9 @@ router.get('/:documentId/clauses',
 // GET /api/analysis/:documentId/risks - Get risk assessment details
 router.get('/:documentId/risks',
   [param('documentId').isUUID().withMessage('Invalid document ID')],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: 'Validation failed',
-          details: errors.array()
-        });
-      }
-
       const { documentId } = req.params;
       const analysis = await getDocumentAnalysis(documentId);
 
@@ -307,15 +269,18 @@ router.get('/:documentId/risks',
         });
       }
 
+      // Count risk levels in one pass over the assessment
+      const riskSummary = { critical: 0, high: 0, medium: 0, low: 0 };
+      for (const risk of analysis.riskAssessment || []) {
+        if (risk.level in riskSummary) {
+          riskSummary[risk.level]++;
+        }
+      }
+
       const riskData = {
         overallRisk: analysis.summary?.overallRisk || 'unknown',
         riskAssessment: analysis.riskAssessment || [],
-        riskSummary: {
-          critical: analysis.riskAssessment?.filter(r => r.level === 'critical').length || 0,
-          high: analysis.riskAssessment?.filter(r => r.level === 'high').length || 0,
-          medium: analysis.riskAssessment?.filter(r => r.level === 'medium').length || 0,
-          low: analysis.riskAssessment?.filter(r => r.level === 'low').length || 0
-        },
+        riskSummary,
         recommendations: analysis.recommendations || [],
         confidence: analysis.confidence || 0
       };
@@ -345,16 +310,9 @@ router.post('/:documentId/plain-language',
     body('section').optional().isString(),
     body('clauseType').optional().isString(),
   ],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: 'Validation failed',
-          details: errors.array()
-        });
-      }
-
       const { documentId } = req.params;
       const { section, clauseType } = req.body;
 
@@ -437,16 +395,9 @@ router.get('/:documentId/export',
     param('documentId').isUUID().withMessage('Invalid document ID'),
     query('format').optional().isIn(['json', 'pdf', 'txt']).withMessage('Invalid export format'),
   ],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: 'Validation failed',
-          details: errors.array()
-        });
-      }
-
       const { documentId } = req.params;
       const { format = 'json' } = req.query;
 
@@ -497,16 +448,9 @@ router.get('/:documentId/export',
 // DELETE /api/analysis/:documentId - Delete analysis
 router.delete('/:documentId',
   [param('documentId').isUUID().withMessage('Invalid document ID')],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: 'Validation failed',
-          details: errors.array()
-        });
-      }
-
       const { documentId } = req.params;
 
       // Remove from voice query system
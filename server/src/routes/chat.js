@@ -1,15 +1,13 @@
 import express from "express";
-import { body, param, query, validationResult } from "express-validator";
-import winston from "winston";
+import { body, param, query } from "express-validator";
+import { handleValidation } from "../middleware/validation.js";
+import rootLogger from "../utils/logger.js";
 import chatService from "../services/chatService.js";
-import databaseService from "../services/databaseService.js";
+import { requireDocument } from "../middleware/requireDocument.js";
+import { decodeCursor } from "../utils/cursor.js";
 
 const router = express.Router();
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "chat-api" },
-});
+const logger = rootLogger.child({ module: "chat-api" });
 
 // POST /api/chat/:documentId/session - Create a new chat session
 router.post(
@@ -19,28 +17,13 @@ router.post(
     body("sessionId").optional().isString(),
     body("title").optional().isString(),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId } = req.params;
       const { sessionId, title } = req.body;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const session = await chatService.createSession(
         documentId,
         sessionId,
@@ -77,28 +60,13 @@ router.post(
       .isIn(["user", "assistant", "system"])
       .withMessage("Invalid message type"),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId } = req.params;
       const { message, sessionId, messageType = "user" } = req.body;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       // Save user message
       const userMessage = await chatService.sendMessage(
         sessionId,
@@ -149,34 +117,24 @@ router.get(
       .optional()
       .isInt({ min: 0 })
       .withMessage("Offset must be non-negative"),
+    query("cursor")
+      .optional()
+      .custom((value) => decodeCursor(value) !== null)
+      .withMessage("Invalid cursor"),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId } = req.params;
-      const { sessionId, limit = 50, offset = 0 } = req.query;
-
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
+      const { sessionId, limit = 50, offset = 0, cursor } = req.query;
 
       const history = await chatService.getChatHistory(
         documentId,
         sessionId,
         parseInt(limit),
         parseInt(offset),
+        cursor,
       );
 
       res.json({
@@ -197,27 +155,12 @@ router.get(
 router.get(
   "/:documentId/sessions",
   [param("documentId").isUUID().withMessage("Invalid document ID")],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId } = req.params;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const sessions = await chatService.getDocumentSessions(documentId);
 
       res.json({
@@ -244,28 +187,13 @@ router.delete(
     param("documentId").isUUID().withMessage("Invalid document ID"),
     query("sessionId").isString().withMessage("Session ID is required"),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId } = req.params;
       const { sessionId } = req.query;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const result = await chatService.deleteSession(sessionId);
 
       res.json({
@@ -289,28 +217,13 @@ router.delete(
     param("documentId").isUUID().withMessage("Invalid document ID"),
     query("sessionId").isString().withMessage("Session ID is required"),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId } = req.params;
       const { sessionId } = req.query;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const result = await chatService.clearChatHistory(documentId, sessionId);
 
       res.json({
@@ -338,28 +251,13 @@ router.get(
       .isIn(["json", "txt"])
       .withMessage("Format must be json or txt"),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId } = req.params;
       const { sessionId, format = "json" } = req.query;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const exportData = await chatService.exportChatHistory(
         documentId,
         sessionId,
@@ -395,27 +293,12 @@ router.get(
     param("documentId").isUUID().withMessage("Invalid document ID"),
     param("sessionId").isString().withMessage("Session ID is required"),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId, sessionId } = req.params;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const stats = await chatService.getSessionStats(sessionId);
 
       res.json({
@@ -2,8 +2,9 @@
 
 import express from "express";
 import multer from "multer";
-import { body, param, validationResult } from "express-validator";
-import winston from "winston";
+import { body, param, query } from "express-validator";
+import { handleValidation } from "../middleware/validation.js";
+import rootLogger from "../utils/logger.js";
 
 import {
   processDocument,
@@ -11,13 +12,24 @@ import {
   getProcessingStatus,
 } from "../services/documentProcessor.js";
 import databaseService from "../services/databaseService.js";
+import { requireDocument } from "../middleware/requireDocument.js";
+import { decodeCursor, encodeCursor } from "../utils/cursor.js";
 
 const router = express.Router();
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "documents-api" },
-});
+const logger = rootLogger.child({ module: "documents-api" });
+
+// MIME types accepted by the document upload filter
+const ALLOWED_UPLOAD_TYPES = new Set([
+  "application/pdf",
+  "application/msword",
+  "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+  "text/plain",
+  "image/jpeg",
+  "image/jpg",
+  "image/png",
+  "image/gif",
+  "image/bmp",
+]);
 
 // Configure multer for file uploads
 const upload = multer({
@@ -27,19 +39,7 @@ const upload = multer({
     files: 5, // Max 5 files at once
   },
   fileFilter: (req, file, cb) => {
-    const allowedTypes = [
-      "application/pdf",
-      "application/msword",
-      "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-      "text/plain",
-      "image/jpeg",
-      "image/jpg",
-      "image/png",
-      "image/gif",
-      "image/bmp",
-    ];
-
-    if (allowedTypes.includes(file.mimetype)) {
+    if (ALLOWED_UPLOAD_TYPES.has(file.mimetype)) {
       cb(null, true);
     } else {
       cb(new Error(`Unsupported file type: ${file.mimetype}`));
@@ -55,17 +55,9 @@ router.post(
     body("options.extractText").optional().isBoolean(),
     body("options.generatePreview").optional().isBoolean(),
   ],
+  handleValidation,
   async (req, res) => {
     try {
-      // Validate request
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       if (!req.file) {
         return res.status(400).json({
           error: "No file uploaded",
@@ -208,16 +200,9 @@ router.post("/batch-upload", upload.array("documents", 5), async (req, res) => {
 router.get(
   "/:documentId/status",
   [param("documentId").isUUID().withMessage("Invalid document ID")],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId } = req.params;
       const status = await getProcessingStatus(documentId);
 
@@ -239,16 +224,9 @@ router.get(
 router.post(
   "/:documentId/reprocess",
   [param("documentId").isUUID().withMessage("Invalid document ID")],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       // This would typically retrieve the original file and reprocess it
       // For now, return a placeholder response
       res.json({
@@ -269,50 +247,84 @@ router.post(
   },
 );
 
-// GET /api/documents - Get all documents
-router.get("/", async (req, res) => {
-  try {
-    const documents = await databaseService.getAllDocuments();
-    res.json({
-      success: true,
-      data: documents,
-    });
-  } catch (error) {
-    logger.error("Failed to get documents:", error);
-    res.status(500).json({
-      error: "Failed to retrieve documents",
-      message: error.message,
-    });
-  }
-});
+// List-view projection of a stored document (everything but extracted_text)
+function toDocumentSummary({ extracted_text, ...summary }) {
+  return summary;
+}
 
-// GET /api/documents/:documentId - Get specific document
+// GET /api/documents - Get all documents, or one page when limit/cursor given
 router.get(
-  "/:documentId",
-  [param("documentId").isUUID().withMessage("Invalid document ID")],
+  "/",
+  [
+    query("limit")
+      .optional()
+      .isInt({ min: 1, max: 100 })
+      .withMessage("Limit must be between 1 and 100"),
+    query("cursor")
+      .optional()
+      .custom((value) => decodeCursor(value) !== null)
+      .withMessage("Invalid cursor"),
+    query("view")
+      .optional()
+      .isIn(["full", "summary"])
+      .withMessage("View must be 'full' or 'summary'"),
+  ],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
+      const { limit, cursor, view = "full" } = req.query;
+      // The summary view leaves out each document's extracted text
+      const project =
+        view === "summary" ? toDocumentSummary : (document) => document;
+
+      if (limit === undefined && cursor === undefined) {
+        const documents = await databaseService.getAllDocuments();
+        return res.json({
+          success: true,
+          data: documents.map(project),
         });
       }
 
-      const { documentId } = req.params;
-      const document = await databaseService.getDocument(documentId);
+      // Keyset pagination: resume after the last document seen
+      const pageSize = parseInt(limit) || 20;
+      const page = await databaseService.getDocumentsAfter(
+        cursor === undefined ? null : decodeCursor(cursor),
+        pageSize + 1,
+      );
+      const hasMore = page.length > pageSize;
+      const documents = hasMore ? page.slice(0, pageSize) : page;
 
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `Document with ID ${documentId} does not exist`,
-        });
-      }
+      res.json({
+        success: true,
+        data: documents.map(project),
+        pagination: {
+          hasMore,
+          nextCursor: hasMore
+            ? encodeCursor(documents[documents.length - 1])
+            : null,
+        },
+      });
+    } catch (error) {
+      logger.error("Failed to get documents:", error);
+      res.status(500).json({
+        error: "Failed to retrieve documents",
+        message: error.message,
+      });
+    }
+  },
+);
 
+// GET /api/documents/:documentId - Get specific document
+router.get(
+  "/:documentId",
+  [param("documentId").isUUID().withMessage("Invalid document ID")],
+  handleValidation,
+  requireDocument,
+  async (req, res) => {
+    try {
       res.json({
         success: true,
-        data: document,
+        data: req.document,
       });
     } catch (error) {
       logger.error("Failed to get document:", error);
@@ -328,19 +340,18 @@ router.get(
 router.delete(
   "/:documentId",
   [param("documentId").isUUID().withMessage("Invalid document ID")],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
+      const { documentId } = req.params;
+      const deleted = await databaseService.deleteDocument(documentId);
+      if (!deleted) {
+        return res.status(404).json({
+          error: "Document not found",
+          message: `No document found with ID: ${documentId}`,
         });
       }
 
-      const { documentId } = req.params;
-      await databaseService.deleteDocument(documentId);
-
       res.json({
         success: true,
         message: "Document deleted successfully",
@@ -355,118 +366,126 @@ router.delete(
   },
 );
 
-// GET /api/documents/supported-types - Get supported file types
-router.get("/supported-types", (req, res) => {
-  const supportedTypes = {
-    documents: {
-      PDF: {
-        extensions: [".pdf"],
-        mimeTypes: ["application/pdf"],
-        description: "Portable Document Format files",
-      },
-      "Microsoft Word": {
-        extensions: [".doc", ".docx"],
-        mimeTypes: [
-          "application/msword",
-          "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        ],
-        description: "Microsoft Word documents",
-      },
-      Text: {
-        extensions: [".txt"],
-        mimeTypes: ["text/plain"],
-        description: "Plain text files",
-      },
+// Both catalogs are static, so build and serialize the responses once
+const SUPPORTED_TYPES = {
+  documents: {
+    PDF: {
+      extensions: [".pdf"],
+      mimeTypes: ["application/pdf"],
+      description: "Portable Document Format files",
     },
-    images: {
-      JPEG: {
-        extensions: [".jpg", ".jpeg"],
-        mimeTypes: ["image/jpeg"],
-        description: "JPEG image files",
-      },
-      PNG: {
-        extensions: [".png"],
-        mimeTypes: ["image/png"],
-        description: "PNG image files",
-      },
-      GIF: {
-        extensions: [".gif"],
-        mimeTypes: ["image/gif"],
-        description: "GIF image files",
-      },
-      BMP: {
-        extensions: [".bmp"],
-        mimeTypes: ["image/bmp"],
-        description: "Bitmap image files",
-      },
+    "Microsoft Word": {
+      extensions: [".doc", ".docx"],
+      mimeTypes: [
+        "application/msword",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+      ],
+      description: "Microsoft Word documents",
+    },
+    Text: {
+      extensions: [".txt"],
+      mimeTypes: ["text/plain"],
+      description: "Plain text files",
     },
-    limits: {
-      maxFileSize: `${process.env.MAX_FILE_SIZE_MB || 50}MB`,
-      maxFiles: 5,
-      totalSizeLimit: `${(parseInt(process.env.MAX_FILE_SIZE_MB) || 50) * 5}MB`,
+  },
+  images: {
+    JPEG: {
+      extensions: [".jpg", ".jpeg"],
+      mimeTypes: ["image/jpeg"],
+      description: "JPEG image files",
+    },
+    PNG: {
+      extensions: [".png"],
+      mimeTypes: ["image/png"],
+      description: "PNG image files",
+    },
+    GIF: {
+      extensions: [".gif"],
+      mimeTypes: ["image/gif"],
+      description: "GIF image files",
     },
-  };
+    BMP: {
+      extensions: [".bmp"],
+      mimeTypes: ["image/bmp"],
+      description: "Bitmap image files",
+    },
+  },
+  limits: {
+    maxFileSize: `${process.env.MAX_FILE_SIZE_MB || 50}MB`,
+    maxFiles: 5,
+    totalSizeLimit: `${(parseInt(process.env.MAX_FILE_SIZE_MB) || 50) * 5}MB`,
+  },
+};
+
+const SUPPORTED_TYPES_BODY = JSON.stringify({
+  success: true,
+  data: SUPPORTED_TYPES,
+});
+
+const DEMO_SAMPLES = [
+  {
+    id: "demo-rental-agreement",
+    name: "Sample Rental Agreement",
+    description:
+      "A standard residential rental agreement with common clauses",
+    type: "Rental Agreement",
+    estimatedProcessingTime: "15 seconds",
+    keyFeatures: ["Termination clauses", "Payment terms", "Security deposit"],
+    downloadUrl: "/api/documents/demo-samples/rental-agreement.pdf",
+  },
+  {
+    id: "demo-employment-contract",
+    name: "Employment Contract Template",
+    description: "Basic employment contract with salary and benefits",
+    type: "Employment Contract",
+    estimatedProcessingTime: "12 seconds",
+    keyFeatures: ["Compensation", "Confidentiality", "Termination"],
+    downloadUrl: "/api/documents/demo-samples/employment-contract.pdf",
+  },
+  {
+    id: "demo-nda",
+    name: "Non-Disclosure Agreement",
+    description: "Standard NDA for protecting confidential information",
+    type: "Non-Disclosure Agreement",
+    estimatedProcessingTime: "8 seconds",
+    keyFeatures: ["Confidentiality terms", "Duration", "Exceptions"],
+    downloadUrl: "/api/documents/demo-samples/nda.pdf",
+  },
+];
+
+const DEMO_SAMPLES_BODY = JSON.stringify({
+  success: true,
+  data: DEMO_SAMPLES,
+});
 
-  res.json({
-    success: true,
-    data: supportedTypes,
-  });
+// GET /api/documents/supported-types - Get supported file types
+router.get("/supported-types", (req, res) => {
+  res.type("json").send(SUPPORTED_TYPES_BODY);
 });
 
 // GET /api/documents/demo-samples - Get demo sample documents
 router.get("/demo-samples", (req, res) => {
-  const demoSamples = [
-    {
-      id: "demo-rental-agreement",
-      name: "Sample Rental Agreement",
-      description:
-        "A standard residential rental agreement with common clauses",
-      type: "Rental Agreement",
-      estimatedProcessingTime: "15 seconds",
-      keyFeatures: ["Termination clauses", "Payment terms", "Security deposit"],
-      downloadUrl: "/api/documents/demo-samples/rental-agreement.pdf",
-    },
-    {
-      id: "demo-employment-contract",
-      name: "Employment Contract Template",
-      description: "Basic employment contract with salary and benefits",
-      type: "Employment Contract",
-      estimatedProcessingTime: "12 seconds",
-      keyFeatures: ["Compensation", "Confidentiality", "Termination"],
-      downloadUrl: "/api/documents/demo-samples/employment-contract.pdf",
-    },
-    {
-      id: "demo-nda",
-      name: "Non-Disclosure Agreement",
-      description: "Standard NDA for protecting confidential information",
-      type: "Non-Disclosure Agreement",
-      estimatedProcessingTime: "8 seconds",
-      keyFeatures: ["Confidentiality terms", "Duration", "Exceptions"],
-      downloadUrl: "/api/documents/demo-samples/nda.pdf",
-    },
-  ];
-
-  res.json({
-    success: true,
-    data: demoSamples,
-  });
+  res.type("json").send(DEMO_SAMPLES_BODY);
 });
 
+// Responses for the multer limit errors this router reports as 400s
+const MULTER_ERROR_RESPONSES = {
+  LIMIT_FILE_SIZE: {
+    error: "File too large",
+    message: `File size should not exceed ${process.env.MAX_FILE_SIZE_MB || 50}MB`,
+  },
+  LIMIT_FILE_COUNT: {
+    error: "Too many files",
+    message: "Maximum 5 files allowed per upload",
+  },
+};
+
 // Error handling middleware for multer
 router.use((err, req, res, next) => {
-  if (err instanceof multer.MulterError) {
-    if (err.code === "LIMIT_FILE_SIZE") {
-      return res.status(400).json({
-        error: "File too large",
-        message: `File size should not exceed ${process.env.MAX_FILE_SIZE_MB || 50}MB`,
-      });
-    }
-    if (err.code === "LIMIT_FILE_COUNT") {
-      return res.status(400).json({
-        error: "Too many files",
-        message: "Maximum 5 files allowed per upload",
-      });
-    }
+  const multerResponse =
+    err instanceof multer.MulterError && MULTER_ERROR_RESPONSES[err.code];
+  if (multerResponse) {
+    return res.status(400).json(multerResponse);
   }
 
   if (err.message.includes("Unsupported file type")) {
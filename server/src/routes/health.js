@@ -1,17 +1,18 @@
 import express from "express";
-import winston from "winston";
+import rootLogger from "../utils/logger.js";
 import databaseService from "../services/databaseService.js";
 import speechService from "../services/speechService.js";
 
 const router = express.Router();
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "health-api" },
-});
+const logger = rootLogger.child({ module: "health-api" });
+
+// Bytes to whole megabytes
+const toMB = (bytes) => Math.round(bytes / 1024 / 1024);
 
 // GET /api/health - Basic health check
 router.get("/", (req, res) => {
+  // One memoryUsage() call per request; each call walks the heap spaces
+  const memory = process.memoryUsage();
   const healthStatus = {
     status: "healthy",
     timestamp: new Date().toISOString(),
@@ -30,9 +31,9 @@ router.get("/", (req, res) => {
       platform: process.platform,
       architecture: process.arch,
       memory: {
-        used: Math.round(process.memoryUsage().heapUsed / 1024 / 1024),
-        total: Math.round(process.memoryUsage().heapTotal / 1024 / 1024),
-        external: Math.round(process.memoryUsage().external / 1024 / 1024),
+        used: toMB(memory.heapUsed),
+        total: toMB(memory.heapTotal),
+        external: toMB(memory.external),
       },
       cpu: {
         usage: process.cpuUsage(),
@@ -49,8 +50,11 @@ router.get("/", (req, res) => {
 // GET /api/health/detailed - Detailed health check with service tests
 router.get("/detailed", async (req, res) => {
   try {
-    const dbHealth = await databaseService.healthCheck();
-    const voiceHealth = await speechService.healthCheck();
+    const [dbHealth, voiceHealth] = await Promise.all([
+      databaseService.healthCheck(),
+      speechService.healthCheck(),
+    ]);
+    const memory = process.memoryUsage();
 
     const healthStatus = {
       status: "healthy",
@@ -83,9 +87,9 @@ router.get("/detailed", async (req, res) => {
         platform: process.platform,
         architecture: process.arch,
         memory: {
-          used: Math.round(process.memoryUsage().heapUsed / 1024 / 1024),
-          total: Math.round(process.memoryUsage().heapTotal / 1024 / 1024),
-          external: Math.round(process.memoryUsage().external / 1024 / 1024),
+          used: toMB(memory.heapUsed),
+          total: toMB(memory.heapTotal),
+          external: toMB(memory.external),
         },
         cpu: {
           usage: process.cpuUsage(),
@@ -118,14 +122,15 @@ router.get("/detailed", async (req, res) => {
 // GET /api/health/metrics - Runtime metrics
 router.get("/metrics", (req, res) => {
   try {
+    const memory = process.memoryUsage();
     const metrics = {
       timestamp: new Date().toISOString(),
       uptime: process.uptime(),
       memory: {
-        used: Math.round(process.memoryUsage().heapUsed / 1024 / 1024),
-        total: Math.round(process.memoryUsage().heapTotal / 1024 / 1024),
-        external: Math.round(process.memoryUsage().external / 1024 / 1024),
-        rss: Math.round(process.memoryUsage().rss / 1024 / 1024),
+        used: toMB(memory.heapUsed),
+        total: toMB(memory.heapTotal),
+        external: toMB(memory.external),
+        rss: toMB(memory.rss),
       },
       cpu: process.cpuUsage(),
       platform: {
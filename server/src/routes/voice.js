@@ -1,16 +1,23 @@
 import express from "express";
 import multer from "multer";
-import { body, param, validationResult } from "express-validator";
-import winston from "winston";
+import { body, param } from "express-validator";
+import { handleValidation } from "../middleware/validation.js";
+import rootLogger from "../utils/logger.js";
 import speechService from "../services/speechService.js";
-import databaseService from "../services/databaseService.js";
+import { requireDocument } from "../middleware/requireDocument.js";
 
 const router = express.Router();
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "voice-api" },
-});
+const logger = rootLogger.child({ module: "voice-api" });
+
+// MIME types accepted by the audio upload filter
+const ALLOWED_AUDIO_TYPES = new Set([
+  "audio/wav",
+  "audio/mp3",
+  "audio/mpeg",
+  "audio/m4a",
+  "audio/ogg",
+  "audio/webm",
+]);
 
 // Configure multer for audio uploads
 const upload = multer({
@@ -20,16 +27,7 @@ const upload = multer({
     files: 1,
   },
   fileFilter: (req, file, cb) => {
-    const allowedTypes = [
-      "audio/wav",
-      "audio/mp3",
-      "audio/mpeg",
-      "audio/m4a",
-      "audio/ogg",
-      "audio/webm",
-    ];
-
-    if (allowedTypes.includes(file.mimetype)) {
+    if (ALLOWED_AUDIO_TYPES.has(file.mimetype)) {
       cb(null, true);
     } else {
       cb(new Error(`Unsupported audio type: ${file.mimetype}`));
@@ -46,16 +44,10 @@ router.post(
     body("sessionId").optional().isString(),
     body("language").optional().isString(),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       if (!req.file) {
         return res.status(400).json({
           error: "No audio file uploaded",
@@ -66,15 +58,6 @@ router.post(
       const { documentId } = req.params;
       const { sessionId, language = "en-US" } = req.body;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const result = await speechService.processVoiceQuery(
         documentId,
         req.file.buffer,
@@ -102,16 +85,9 @@ router.post(
   "/transcribe",
   upload.single("audio"),
   [body("language").optional().isString()],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       if (!req.file) {
         return res.status(400).json({
           error: "No audio file uploaded",
@@ -159,16 +135,9 @@ router.post(
     body("voice").optional().isString(),
     body("language").optional().isString(),
   ],
+  handleValidation,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { text, voice = "en-US-Neural2-D", language = "en-US" } = req.body;
 
       const synthesis = await speechService.synthesizeSpeech(
@@ -205,27 +174,12 @@ router.get(
     param("documentId").isUUID().withMessage("Invalid document ID"),
     param("sessionId").isString().withMessage("Session ID is required"),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId, sessionId } = req.params;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const history = await speechService.getVoiceSessionHistory(
         documentId,
         sessionId,
@@ -252,27 +206,12 @@ router.delete(
     param("documentId").isUUID().withMessage("Invalid document ID"),
     param("sessionId").isString().withMessage("Session ID is required"),
   ],
+  handleValidation,
+  requireDocument,
   async (req, res) => {
     try {
-      const errors = validationResult(req);
-      if (!errors.isEmpty()) {
-        return res.status(400).json({
-          error: "Validation failed",
-          details: errors.array(),
-        });
-      }
-
       const { documentId, sessionId } = req.params;
 
-      // Check if document exists
-      const document = await databaseService.getDocument(documentId);
-      if (!document) {
-        return res.status(404).json({
-          error: "Document not found",
-          message: `No document found with ID: ${documentId}`,
-        });
-      }
-
       const result = await speechService.deleteVoiceSession(sessionId);
 
       res.json({
@@ -332,21 +271,24 @@ router.get("/stats", async (req, res) => {
   }
 });
 
+// Responses for the multer limit errors this router reports as 400s
+const MULTER_ERROR_RESPONSES = {
+  LIMIT_FILE_SIZE: {
+    error: "Audio file too large",
+    message: "Audio file size should not exceed 50MB",
+  },
+  LIMIT_FILE_COUNT: {
+    error: "Too many files",
+    message: "Only one audio file allowed per request",
+  },
+};
+
 // Error handling middleware for multer
 router.use((err, req, res, next) => {
-  if (err instanceof multer.MulterError) {
-    if (err.code === "LIMIT_FILE_SIZE") {
-      return res.status(400).json({
-        error: "Audio file too large",
-        message: "Audio file size should not exceed 50MB",
-      });
-    }
-    if (err.code === "LIMIT_FILE_COUNT") {
-      return res.status(400).json({
-        error: "Too many files",
-        message: "Only one audio file allowed per request",
-      });
-    }
+  const multerResponse =
+    err instanceof multer.MulterError && MULTER_ERROR_RESPONSES[err.code];
+  if (multerResponse) {
+    return res.status(400).json(multerResponse);
   }
 
   if (err.message.includes("Unsupported audio type")) {
@@ -1,17 +1,14 @@
+import { createHash } from "crypto";
 import natural from "natural";
 import compromise from "compromise";
 import sentiment from "sentiment";
 import keywordExtractor from "keyword-extractor";
 // tiktoken import removed - was unused
-import winston from "winston";
+import rootLogger from "../utils/logger.js";
 
 import { getVertexAIModel } from "./googleCloud.js";
 
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "ai-analyzer" },
-});
+const logger = rootLogger.child({ module: "ai-analyzer" });
 
 // Initialize NLP tools
 const tokenizer = natural.WordTokenizer;
@@ -125,6 +122,19 @@ const LEGAL_PATTERNS = {
   },
 };
 
+// Word-boundary keyword regexes per clause type, compiled once instead of on
+// every detectClauses call
+const CLAUSE_KEYWORD_REGEXES = Object.fromEntries(
+  Object.entries(LEGAL_PATTERNS).map(([clauseType, config]) => [
+    clauseType,
+    config.keywords.map((keyword) => ({
+      keyword,
+      lowerKeyword: keyword.toLowerCase(),
+      regex: new RegExp(`\\b${keyword}\\b`, "gi"),
+    })),
+  ]),
+);
+
 // Risk scoring weights
 const RISK_WEIGHTS = {
   critical: 5,
@@ -134,9 +144,62 @@ const RISK_WEIGHTS = {
   minimal: 1,
 };
 
+// Display titles for each clause type, built once from LEGAL_PATTERNS
+const CLAUSE_TITLES = Object.fromEntries(
+  Object.keys(LEGAL_PATTERNS).map((clauseType) => [
+    clauseType,
+    formatClauseTitle(clauseType),
+  ]),
+);
+
+const CLAUSE_RECOMMENDATIONS = {
+  termination: [
+    "Review notice periods carefully",
+    "Understand conditions that trigger termination",
+    "Consider negotiating more favorable terms",
+  ],
+  payment: [
+    "Verify payment amounts and due dates",
+    "Check for late payment penalties",
+    "Ensure payment terms are acceptable",
+  ],
+  liability: [
+    "Understand your liability exposure",
+    "Consider liability insurance",
+    "Negotiate liability caps where possible",
+  ],
+  confidentiality: [
+    "Identify what information is considered confidential",
+    "Understand disclosure restrictions",
+    "Verify compliance requirements",
+  ],
+};
+
+const DEFAULT_CLAUSE_RECOMMENDATIONS = [
+  "Consult with legal counsel for guidance",
+];
+
+// LRU of completed analyses keyed by a hash of the document text, so
+// re-analyzing the same text skips the NLP pipeline and Gemini calls
+const analysisMemo = new Map();
+const ANALYSIS_MEMO_MAX_ENTRIES = 50;
+
 // Main document analysis function
 export async function analyzeDocument(documentText, options = {}) {
   const startTime = Date.now();
+  const memoKey = createHash("sha256").update(documentText).digest("base64");
+
+  const memoized = analysisMemo.get(memoKey);
+  if (memoized) {
+    analysisMemo.delete(memoKey);
+    analysisMemo.set(memoKey, memoized);
+    logger.info("Reusing analysis of identical document text");
+    return {
+      ...memoized,
+      processingTime: Date.now() - startTime,
+      metadata: { ...memoized.metadata, timestamp: new Date().toISOString() },
+    };
+  }
 
   try {
     logger.info("Starting comprehensive document analysis");
@@ -156,13 +219,14 @@ export async function analyzeDocument(documentText, options = {}) {
 
     // Generate overall risk score
     const overallRisk = calculateOverallRisk(riskAssessment);
+    const wordCount = countWords(preprocessedText);
 
     // Create analysis result
     const analysis = {
       summary: {
         documentType: detectDocumentType(preprocessedText),
-        wordCount: countWords(preprocessedText),
-        readingTime: Math.ceil(countWords(preprocessedText) / 250), // minutes
+        wordCount,
+        readingTime: Math.ceil(wordCount / 250), // minutes
         overallRisk: overallRisk,
         keyParties: extractParties(preprocessedText),
         importantDates: extractDates(preprocessedText),
@@ -183,6 +247,14 @@ export async function analyzeDocument(documentText, options = {}) {
       },
     };
 
+    // Don't memoize degraded results from failed Gemini calls
+    if (summary.confidence !== 0 && plainLanguage.confidence !== 0) {
+      analysisMemo.set(memoKey, analysis);
+      if (analysisMemo.size > ANALYSIS_MEMO_MAX_ENTRIES) {
+        analysisMemo.delete(analysisMemo.keys().next().value);
+      }
+    }
+
     logger.info(`Document analysis completed in ${analysis.processingTime}ms`);
     return analysis;
   } catch (error) {
@@ -206,13 +278,15 @@ function preprocessText(text) {
 async function detectClauses(text) {
   const clauses = [];
   const sentences = text.split(/[.!?]+/).filter((s) => s.trim().length > 10);
+  // Lowercased once here rather than per clause type and keyword below
+  const lowerSentences = sentences.map((s) => s.toLowerCase());
 
   for (const [clauseType, config] of Object.entries(LEGAL_PATTERNS)) {
     const matches = [];
 
     // Keyword matching
-    config.keywords.forEach((keyword) => {
-      const regex = new RegExp(`\\b${keyword}\\b`, "gi");
+    const keywordRegexes = CLAUSE_KEYWORD_REGEXES[clauseType];
+    keywordRegexes.forEach(({ keyword, regex }) => {
       let match;
       while ((match = regex.exec(text)) !== null) {
         matches.push({
@@ -238,15 +312,15 @@ async function detectClauses(text) {
 
     if (matches.length > 0) {
       // Find relevant sentences
-      const relevantSentences = sentences.filter((sentence) =>
-        config.keywords.some((keyword) =>
-          sentence.toLowerCase().includes(keyword.toLowerCase()),
+      const relevantSentences = sentences.filter((sentence, i) =>
+        keywordRegexes.some(({ lowerKeyword }) =>
+          lowerSentences[i].includes(lowerKeyword),
         ),
       );
 
       clauses.push({
         type: clauseType,
-        title: formatClauseTitle(clauseType),
+        title: CLAUSE_TITLES[clauseType],
         riskLevel: config.riskLevel,
         matches: matches.length,
         content: relevantSentences.slice(0, 3), // Top 3 relevant sentences
@@ -415,39 +489,42 @@ function countWords(text) {
   return text.trim().split(/\s+/).length;
 }
 
-function detectDocumentType(text) {
-  const types = {
-    "Employment Contract": [
-      "employment",
-      "employee",
-      "salary",
-      "job",
-      "position",
-    ],
-    "Service Agreement": ["services", "provider", "client", "deliverables"],
-    "Rental Agreement": ["rent", "lease", "tenant", "landlord", "property"],
-    "Non-Disclosure Agreement": [
-      "confidential",
-      "disclosure",
-      "proprietary",
-      "nda",
-    ],
-    "Terms of Service": ["terms", "service", "user", "website", "platform"],
-    "License Agreement": [
-      "license",
-      "software",
-      "use",
-      "permitted",
-      "restricted",
-    ],
-  };
+// Keyword regexes per document type, compiled once at module load
+const DOCUMENT_TYPE_REGEXES = Object.entries({
+  "Employment Contract": [
+    "employment",
+    "employee",
+    "salary",
+    "job",
+    "position",
+  ],
+  "Service Agreement": ["services", "provider", "client", "deliverables"],
+  "Rental Agreement": ["rent", "lease", "tenant", "landlord", "property"],
+  "Non-Disclosure Agreement": [
+    "confidential",
+    "disclosure",
+    "proprietary",
+    "nda",
+  ],
+  "Terms of Service": ["terms", "service", "user", "website", "platform"],
+  "License Agreement": [
+    "license",
+    "software",
+    "use",
+    "permitted",
+    "restricted",
+  ],
+}).map(([type, keywords]) => [
+  type,
+  keywords.map((keyword) => new RegExp(`\\b${keyword}\\b`, "gi")),
+]);
 
+function detectDocumentType(text) {
   let maxScore = 0;
   let detectedType = "Legal Document";
 
-  Object.entries(types).forEach(([type, keywords]) => {
-    const score = keywords.reduce((acc, keyword) => {
-      const regex = new RegExp(`\\b${keyword}\\b`, "gi");
+  DOCUMENT_TYPE_REGEXES.forEach(([type, regexes]) => {
+    const score = regexes.reduce((acc, regex) => {
       const matches = text.match(regex);
       return acc + (matches ? matches.length : 0);
     }, 0);
@@ -462,40 +539,57 @@ function detectDocumentType(text) {
 }
 
 // Risk analysis functions
-function analyzeFinancialRisk(text) {
-  const financialKeywords = [
-    "payment",
-    "fee",
-    "cost",
-    "penalty",
-    "fine",
-    "charge",
-    "amount",
-    "price",
-  ];
-  const riskKeywords = [
-    "late",
-    "default",
-    "breach",
-    "penalty",
-    "interest",
-    "compound",
-  ];
 
+// Builds one whole-word alternation over every keyword a risk analyzer
+// counts, so the text is scanned once rather than once per keyword
+function keywordAlternation(...keywordLists) {
+  const keywords = [...new Set(keywordLists.flat())];
+  return new RegExp(`\\b(?:${keywords.join("|")})\\b`, "g");
+}
+
+// Tallies whole-word keyword occurrences in a single pass over the text
+function countKeywords(text, regex) {
+  const counts = new Map();
+  for (const [keyword] of text.toLowerCase().matchAll(regex)) {
+    counts.set(keyword, (counts.get(keyword) || 0) + 1);
+  }
+  return counts;
+}
+
+const FINANCIAL_KEYWORDS = [
+  "payment",
+  "fee",
+  "cost",
+  "penalty",
+  "fine",
+  "charge",
+  "amount",
+  "price",
+];
+const FINANCIAL_RISK_KEYWORDS = [
+  "late",
+  "default",
+  "breach",
+  "penalty",
+  "interest",
+  "compound",
+];
+const FINANCIAL_KEYWORD_REGEX = keywordAlternation(
+  FINANCIAL_KEYWORDS,
+  FINANCIAL_RISK_KEYWORDS,
+);
+
+function analyzeFinancialRisk(text) {
+  const counts = countKeywords(text, FINANCIAL_KEYWORD_REGEX);
   let score = 0;
   let details = [];
 
-  financialKeywords.forEach((keyword) => {
-    const matches = (
-      text.toLowerCase().match(new RegExp(`\\b${keyword}\\b`, "g")) || []
-    ).length;
-    score += matches * 0.1;
+  FINANCIAL_KEYWORDS.forEach((keyword) => {
+    score += (counts.get(keyword) || 0) * 0.1;
   });
 
-  riskKeywords.forEach((keyword) => {
-    const matches = (
-      text.toLowerCase().match(new RegExp(`\\b${keyword}\\b`, "g")) || []
-    ).length;
+  FINANCIAL_RISK_KEYWORDS.forEach((keyword) => {
+    const matches = counts.get(keyword) || 0;
     score += matches * 0.2;
     if (matches > 0)
       details.push(`Contains ${matches} references to ${keyword}`);
@@ -513,37 +607,37 @@ function analyzeFinancialRisk(text) {
   return { score: Math.min(score, 1), level, details };
 }
 
-function analyzeComplianceRisk(text) {
-  const complianceKeywords = [
-    "comply",
-    "regulation",
-    "law",
-    "legal",
-    "requirement",
-    "mandatory",
-  ];
-  const riskKeywords = [
-    "violation",
-    "breach",
-    "non-compliance",
-    "penalty",
-    "fine",
-  ];
+const COMPLIANCE_KEYWORDS = [
+  "comply",
+  "regulation",
+  "law",
+  "legal",
+  "requirement",
+  "mandatory",
+];
+const COMPLIANCE_RISK_KEYWORDS = [
+  "violation",
+  "breach",
+  "non-compliance",
+  "penalty",
+  "fine",
+];
+const COMPLIANCE_KEYWORD_REGEX = keywordAlternation(
+  COMPLIANCE_KEYWORDS,
+  COMPLIANCE_RISK_KEYWORDS,
+);
 
+function analyzeComplianceRisk(text) {
+  const counts = countKeywords(text, COMPLIANCE_KEYWORD_REGEX);
   let score = 0;
   let details = [];
 
-  complianceKeywords.forEach((keyword) => {
-    const matches = (
-      text.toLowerCase().match(new RegExp(`\\b${keyword}\\b`, "g")) || []
-    ).length;
-    score += matches * 0.08;
+  COMPLIANCE_KEYWORDS.forEach((keyword) => {
+    score += (counts.get(keyword) || 0) * 0.08;
   });
 
-  riskKeywords.forEach((keyword) => {
-    const matches = (
-      text.toLowerCase().match(new RegExp(`\\b${keyword}\\b`, "g")) || []
-    ).length;
+  COMPLIANCE_RISK_KEYWORDS.forEach((keyword) => {
+    const matches = counts.get(keyword) || 0;
     score += matches * 0.15;
     if (matches > 0)
       details.push(`Contains ${matches} references to ${keyword}`);
@@ -561,30 +655,36 @@ function analyzeComplianceRisk(text) {
   return { score: Math.min(score, 1), level, details };
 }
 
-function analyzeOperationalRisk(text) {
-  const operationalKeywords = [
-    "perform",
-    "deliver",
-    "provide",
-    "maintain",
-    "support",
-  ];
-  const riskKeywords = ["failure", "delay", "unable", "impossible", "restrict"];
+const OPERATIONAL_KEYWORDS = [
+  "perform",
+  "deliver",
+  "provide",
+  "maintain",
+  "support",
+];
+const OPERATIONAL_RISK_KEYWORDS = [
+  "failure",
+  "delay",
+  "unable",
+  "impossible",
+  "restrict",
+];
+const OPERATIONAL_KEYWORD_REGEX = keywordAlternation(
+  OPERATIONAL_KEYWORDS,
+  OPERATIONAL_RISK_KEYWORDS,
+);
 
+function analyzeOperationalRisk(text) {
+  const counts = countKeywords(text, OPERATIONAL_KEYWORD_REGEX);
   let score = 0;
   let details = [];
 
-  operationalKeywords.forEach((keyword) => {
-    const matches = (
-      text.toLowerCase().match(new RegExp(`\\b${keyword}\\b`, "g")) || []
-    ).length;
-    score += matches * 0.05;
+  OPERATIONAL_KEYWORDS.forEach((keyword) => {
+    score += (counts.get(keyword) || 0) * 0.05;
   });
 
-  riskKeywords.forEach((keyword) => {
-    const matches = (
-      text.toLowerCase().match(new RegExp(`\\b${keyword}\\b`, "g")) || []
-    ).length;
+  OPERATIONAL_RISK_KEYWORDS.forEach((keyword) => {
+    const matches = counts.get(keyword) || 0;
     score += matches * 0.1;
     if (matches > 0)
       details.push(`Contains ${matches} references to ${keyword}`);
@@ -595,7 +695,8 @@ function analyzeOperationalRisk(text) {
   return { score: Math.min(score, 1), level, details };
 }
 
-// Additional extraction functions
+// Additional extraction functions; their patterns are module constants so
+// each call reuses the same compiled regexes
 function extractKeyTerms(text) {
   return keywordExtractor
     .extract(text, {
@@ -607,15 +708,15 @@ function extractKeyTerms(text) {
     .slice(0, 20);
 }
 
+const PARTY_PATTERNS = [
+  /(?:party|parties|company|corporation|individual|entity)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*/g,
+  /[A-Z][a-z]+\s+(?:Inc|LLC|Corp|Ltd|Co)\b/g,
+];
+
 function extractParties(text) {
   // Simple party extraction - in production, use NER
   const parties = [];
-  const partyPatterns = [
-    /(?:party|parties|company|corporation|individual|entity)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*/g,
-    /[A-Z][a-z]+\s+(?:Inc|LLC|Corp|Ltd|Co)\b/g,
-  ];
-
-  partyPatterns.forEach((pattern) => {
+  PARTY_PATTERNS.forEach((pattern) => {
     const matches = text.match(pattern);
     if (matches) parties.push(...matches);
   });
@@ -623,15 +724,15 @@ function extractParties(text) {
   return [...new Set(parties)].slice(0, 5);
 }
 
-function extractDates(text) {
-  const datePatterns = [
-    /\b\d{1,2}\/\d{1,2}\/\d{4}\b/g,
-    /\b\d{4}-\d{2}-\d{2}\b/g,
-    /\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b/g,
-  ];
+const DATE_PATTERNS = [
+  /\b\d{1,2}\/\d{1,2}\/\d{4}\b/g,
+  /\b\d{4}-\d{2}-\d{2}\b/g,
+  /\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b/g,
+];
 
+function extractDates(text) {
   const dates = [];
-  datePatterns.forEach((pattern) => {
+  DATE_PATTERNS.forEach((pattern) => {
     const matches = text.match(pattern);
     if (matches) dates.push(...matches);
   });
@@ -639,15 +740,15 @@ function extractDates(text) {
   return [...new Set(dates)];
 }
 
-function extractAmounts(text) {
-  const amountPatterns = [
-    /\$[\d,]+(?:\.\d{2})?/g,
-    /\b\d+\s*(?:dollars?|USD)\b/g,
-    /\b(?:amount|sum|fee|cost|price|charge)\s+of\s+\$?[\d,]+(?:\.\d{2})?/g,
-  ];
+const AMOUNT_PATTERNS = [
+  /\$[\d,]+(?:\.\d{2})?/g,
+  /\b\d+\s*(?:dollars?|USD)\b/g,
+  /\b(?:amount|sum|fee|cost|price|charge)\s+of\s+\$?[\d,]+(?:\.\d{2})?/g,
+];
 
+function extractAmounts(text) {
   const amounts = [];
-  amountPatterns.forEach((pattern) => {
+  AMOUNT_PATTERNS.forEach((pattern) => {
     const matches = text.match(pattern);
     if (matches) amounts.push(...matches);
   });
@@ -655,14 +756,14 @@ function extractAmounts(text) {
   return [...new Set(amounts)];
 }
 
-function extractObligations(text) {
-  const obligationPatterns = [
-    /\b(?:must|shall|required to|obligated to|responsible for)\s+[^.!?]+[.!?]/g,
-    /\b(?:agrees to|commits to|undertakes to)\s+[^.!?]+[.!?]/g,
-  ];
+const OBLIGATION_PATTERNS = [
+  /\b(?:must|shall|required to|obligated to|responsible for)\s+[^.!?]+[.!?]/g,
+  /\b(?:agrees to|commits to|undertakes to)\s+[^.!?]+[.!?]/g,
+];
 
+function extractObligations(text) {
   const obligations = [];
-  obligationPatterns.forEach((pattern) => {
+  OBLIGATION_PATTERNS.forEach((pattern) => {
     const matches = text.match(pattern);
     if (matches) obligations.push(...matches.slice(0, 5));
   });
@@ -670,14 +771,14 @@ function extractObligations(text) {
   return obligations;
 }
 
-function extractRights(text) {
-  const rightPatterns = [
-    /\b(?:entitled to|right to|may|permitted to)\s+[^.!?]+[.!?]/g,
-    /\b(?:benefit|advantage|privilege)\s+[^.!?]+[.!?]/g,
-  ];
+const RIGHT_PATTERNS = [
+  /\b(?:entitled to|right to|may|permitted to)\s+[^.!?]+[.!?]/g,
+  /\b(?:benefit|advantage|privilege)\s+[^.!?]+[.!?]/g,
+];
 
+function extractRights(text) {
   const rights = [];
-  rightPatterns.forEach((pattern) => {
+  RIGHT_PATTERNS.forEach((pattern) => {
     const matches = text.match(pattern);
     if (matches) rights.push(...matches.slice(0, 5));
   });
@@ -685,14 +786,14 @@ function extractRights(text) {
   return rights;
 }
 
-function extractDeadlines(text) {
-  const deadlinePatterns = [
-    /\b(?:within|by|before|no later than)\s+\d+\s+(?:days?|weeks?|months?|years?)\b/g,
-    /\b(?:deadline|due date|expiry|expiration)\s+[^.!?]+[.!?]/g,
-  ];
+const DEADLINE_PATTERNS = [
+  /\b(?:within|by|before|no later than)\s+\d+\s+(?:days?|weeks?|months?|years?)\b/g,
+  /\b(?:deadline|due date|expiry|expiration)\s+[^.!?]+[.!?]/g,
+];
 
+function extractDeadlines(text) {
   const deadlines = [];
-  deadlinePatterns.forEach((pattern) => {
+  DEADLINE_PATTERNS.forEach((pattern) => {
     const matches = text.match(pattern);
     if (matches) deadlines.push(...matches);
   });
@@ -700,14 +801,14 @@ function extractDeadlines(text) {
   return [...new Set(deadlines)];
 }
 
-function extractPenalties(text) {
-  const penaltyPatterns = [
-    /\b(?:penalty|fine|charge|fee)\s+[^.!?]+[.!?]/g,
-    /\b(?:breach|default|violation)\s+[^.!?]*(?:penalty|fine|charge)[^.!?]*[.!?]/g,
-  ];
+const PENALTY_PATTERNS = [
+  /\b(?:penalty|fine|charge|fee)\s+[^.!?]+[.!?]/g,
+  /\b(?:breach|default|violation)\s+[^.!?]*(?:penalty|fine|charge)[^.!?]*[.!?]/g,
+];
 
+function extractPenalties(text) {
   const penalties = [];
-  penaltyPatterns.forEach((pattern) => {
+  PENALTY_PATTERNS.forEach((pattern) => {
     const matches = text.match(pattern);
     if (matches) penalties.push(...matches);
   });
@@ -715,14 +816,14 @@ function extractPenalties(text) {
   return [...new Set(penalties)];
 }
 
-function extractBenefits(text) {
-  const benefitPatterns = [
-    /\b(?:benefit|advantage|gain|profit|compensation)\s+[^.!?]+[.!?]/g,
-    /\b(?:receive|obtain|get|acquire)\s+[^.!?]*(?:benefit|compensation|payment)[^.!?]*[.!?]/g,
-  ];
+const BENEFIT_PATTERNS = [
+  /\b(?:benefit|advantage|gain|profit|compensation)\s+[^.!?]+[.!?]/g,
+  /\b(?:receive|obtain|get|acquire)\s+[^.!?]*(?:benefit|compensation|payment)[^.!?]*[.!?]/g,
+];
 
+function extractBenefits(text) {
   const benefits = [];
-  benefitPatterns.forEach((pattern) => {
+  BENEFIT_PATTERNS.forEach((pattern) => {
     const matches = text.match(pattern);
     if (matches) benefits.push(...matches);
   });
@@ -759,44 +860,34 @@ async function summarizeClause(clauseText, clauseType) {
   return sentences.slice(0, 2).join(". ").trim() + ".";
 }
 
+// Legalese -> plain word substitutions, applied in a single regex pass
+const PLAIN_LANGUAGE_TERMS = {
+  whereas: "since",
+  therefore: "so",
+  shall: "will",
+  hereby: "",
+  heretofore: "before this",
+};
+const PLAIN_LANGUAGE_REGEX = new RegExp(
+  `\\b(?:${Object.keys(PLAIN_LANGUAGE_TERMS).join("|")})\\b`,
+  "gi",
+);
+
 async function translateToPlainLanguage(clauseText) {
   // Simple plain language conversion - in production, use advanced AI
   return clauseText
-    .replace(/\bwhereas\b/gi, "since")
-    .replace(/\btherefore\b/gi, "so")
-    .replace(/\bshall\b/gi, "will")
-    .replace(/\bhereby\b/gi, "")
-    .replace(/\bheretofore\b/gi, "before this")
+    .replace(
+      PLAIN_LANGUAGE_REGEX,
+      (term) => PLAIN_LANGUAGE_TERMS[term.toLowerCase()],
+    )
     .trim();
 }
 
+// Returns a fresh array so callers can't mutate the shared tables
 function getClauseRecommendations(clauseType, riskLevel) {
-  const recommendations = {
-    termination: [
-      "Review notice periods carefully",
-      "Understand conditions that trigger termination",
-      "Consider negotiating more favorable terms",
-    ],
-    payment: [
-      "Verify payment amounts and due dates",
-      "Check for late payment penalties",
-      "Ensure payment terms are acceptable",
-    ],
-    liability: [
-      "Understand your liability exposure",
-      "Consider liability insurance",
-      "Negotiate liability caps where possible",
-    ],
-    confidentiality: [
-      "Identify what information is considered confidential",
-      "Understand disclosure restrictions",
-      "Verify compliance requirements",
-    ],
-  };
-
-  return (
-    recommendations[clauseType] || ["Consult with legal counsel for guidance"]
-  );
+  return [
+    ...(CLAUSE_RECOMMENDATIONS[clauseType] || DEFAULT_CLAUSE_RECOMMENDATIONS),
+  ];
 }
 
 function generateRecommendations(riskAssessment, clauses) {
@@ -1,12 +1,27 @@
 import { v4 as uuidv4 } from "uuid";
-import winston from "winston";
+import rootLogger from "../utils/logger.js";
 import databaseService from "./databaseService.js";
 import ragService from "./ragService.js";
+import { decodeCursor, encodeCursor } from "../utils/cursor.js";
+
+const logger = rootLogger.child({ module: "chat" });
+
+// Same output as Date#toLocaleString(), but the locale data is resolved once
+// instead of for every exported message
+const MESSAGE_TIMESTAMP_FORMAT = new Intl.DateTimeFormat(undefined, {
+  year: "numeric",
+  month: "numeric",
+  day: "numeric",
+  hour: "numeric",
+  minute: "numeric",
+  second: "numeric",
+});
 
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "chat" },
+// Same output as Date#toLocaleDateString(), resolved once for default titles
+const SESSION_TITLE_DATE_FORMAT = new Intl.DateTimeFormat(undefined, {
+  year: "numeric",
+  month: "numeric",
+  day: "numeric",
 });
 
 class ChatService {
@@ -19,7 +34,7 @@ class ChatService {
     try {
       const newSessionId = sessionId || uuidv4();
       const sessionTitle =
-        title || `Chat Session ${new Date().toLocaleDateString()}`;
+        title || `Chat Session ${SESSION_TITLE_DATE_FORMAT.format(new Date())}`;
 
       const sessionData = {
         id: uuidv4(),
@@ -28,25 +43,36 @@ class ChatService {
         title: sessionTitle,
       };
 
-      await databaseService.createChatSession(sessionData);
-
-      // Store in memory for quick access
-      this.activeSessions.set(newSessionId, {
-        documentId,
-        title: sessionTitle,
-        createdAt: new Date(),
-        messageCount: 0,
-      });
+      const { session, created } =
+        await databaseService.createChatSession(sessionData);
+
+      // Re-posting an existing session leaves its stored title, creation
+      // time and in-memory message count as they were; it is only re-tracked
+      // (with its stored message count) if it had dropped out of memory
+      if (!this.activeSessions.has(newSessionId)) {
+        const messageCount = created
+          ? 0
+          : (await databaseService.getChatHistory(documentId, newSessionId))
+              .length;
+        this.activeSessions.set(newSessionId, {
+          documentId,
+          title: session.title,
+          createdAt: new Date(session.created_at),
+          messageCount,
+        });
+      }
 
-      logger.info(
-        `Created chat session: ${newSessionId} for document: ${documentId}`,
-      );
+      if (created) {
+        logger.info(
+          `Created chat session: ${newSessionId} for document: ${documentId}`,
+        );
+      }
 
       return {
         sessionId: newSessionId,
         documentId,
-        title: sessionTitle,
-        createdAt: new Date().toISOString(),
+        title: session.title,
+        createdAt: session.created_at,
       };
     } catch (error) {
       logger.error("Failed to create chat session:", error);
@@ -100,8 +126,37 @@ class ChatService {
   }
 
   // Get chat history for a session
-  async getChatHistory(documentId, sessionId, limit = 50, offset = 0) {
+  async getChatHistory(
+    documentId,
+    sessionId,
+    limit = 50,
+    offset = 0,
+    cursor = null,
+  ) {
     try {
+      // Cursor (keyset) pagination: resume after the last message seen
+      // without materialising or counting the whole history
+      if (cursor) {
+        const page = await databaseService.getChatHistoryAfter(
+          documentId,
+          sessionId,
+          decodeCursor(cursor),
+          limit + 1,
+        );
+        const hasMore = page.length > limit;
+        const messages = hasMore ? page.slice(0, limit) : page;
+
+        return {
+          messages,
+          hasMore,
+          nextCursor: hasMore
+            ? encodeCursor(messages[messages.length - 1])
+            : null,
+          sessionId,
+          documentId,
+        };
+      }
+
       const messages = await databaseService.getChatHistory(
         documentId,
         sessionId,
@@ -110,10 +165,16 @@ class ChatService {
       // Apply pagination
       const paginatedMessages = messages.slice(offset, offset + limit);
 
+      const hasMore = offset + limit < messages.length;
+
       return {
         messages: paginatedMessages,
         totalMessages: messages.length,
-        hasMore: offset + limit < messages.length,
+        hasMore,
+        nextCursor:
+          hasMore && paginatedMessages.length > 0
+            ? encodeCursor(paginatedMessages[paginatedMessages.length - 1])
+            : null,
         sessionId,
         documentId,
       };
@@ -256,26 +317,32 @@ class ChatService {
         sessionId,
       );
 
+      // One timestamp for both the export metadata and the filename stamp
+      const exportedAt = new Date().toISOString();
+      const exportDate = exportedAt.split("T")[0];
+
+      // Tally message types in one pass instead of one filter per type
+      const typeCounts = { user: 0, assistant: 0, system: 0 };
+      for (const message of history.messages) {
+        if (message.message_type in typeCounts) {
+          typeCounts[message.message_type]++;
+        }
+      }
+
       const exportData = {
         session: {
           sessionId,
           documentId,
           title: session?.title || "Chat Session",
           createdAt: session?.created_at,
-          exportedAt: new Date().toISOString(),
+          exportedAt,
         },
         messages: history.messages,
         statistics: {
           totalMessages: history.totalMessages,
-          userMessages: history.messages.filter(
-            (m) => m.message_type === "user",
-          ).length,
-          assistantMessages: history.messages.filter(
-            (m) => m.message_type === "assistant",
-          ).length,
-          systemMessages: history.messages.filter(
-            (m) => m.message_type === "system",
-          ).length,
+          userMessages: typeCounts.user,
+          assistantMessages: typeCounts.assistant,
+          systemMessages: typeCounts.system,
         },
       };
 
@@ -283,14 +350,14 @@ class ChatService {
         return {
           data: exportData,
           contentType: "application/json",
-          filename: `chat-history-${sessionId}-${new Date().toISOString().split("T")[0]}.json`,
+          filename: `chat-history-${sessionId}-${exportDate}.json`,
         };
       } else if (format === "txt") {
         const textContent = this.formatChatAsText(exportData);
         return {
           data: textContent,
           contentType: "text/plain",
-          filename: `chat-history-${sessionId}-${new Date().toISOString().split("T")[0]}.txt`,
+          filename: `chat-history-${sessionId}-${exportDate}.txt`,
         };
       } else {
         throw new Error("Unsupported export format");
@@ -312,7 +379,9 @@ class ChatService {
     text += `--- Messages ---\n\n`;
 
     exportData.messages.forEach((message, index) => {
-      const timestamp = new Date(message.created_at).toLocaleString();
+      const timestamp = MESSAGE_TIMESTAMP_FORMAT.format(
+        new Date(message.created_at),
+      );
       text += `[${timestamp}] ${message.message_type.toUpperCase()}:\n`;
       text += `${message.content}\n\n`;
     });
@@ -1,11 +1,76 @@
 // In-memory storage for now (no SQLite dependency)
-import winston from "winston";
+import rootLogger from "../utils/logger.js";
 
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "database" },
-});
+const logger = rootLogger.child({ module: "database" });
+
+// Shared default for messages saved without metadata (read-only)
+const EMPTY_METADATA = Object.freeze({});
+
+// Secondary index helpers: key -> Set of records, in insertion order
+function sessionKey(documentId, sessionId) {
+  return `${documentId}:${sessionId}`;
+}
+
+function addToIndex(index, key, record) {
+  let bucket = index.get(key);
+  if (!bucket) {
+    bucket = new Set();
+    index.set(key, bucket);
+  }
+  bucket.add(record);
+}
+
+function removeFromIndex(index, key, record) {
+  const bucket = index.get(key);
+  if (bucket) {
+    bucket.delete(record);
+    if (bucket.size === 0) {
+      index.delete(key);
+    }
+  }
+}
+
+function firstInIndex(index, key) {
+  const bucket = index.get(key);
+  if (!bucket) return null;
+  for (const record of bucket) return record;
+  return null;
+}
+
+// First position in a chronological message list with created_at >= timestamp
+function lowerBound(messages, timestamp) {
+  let low = 0;
+  let high = messages.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (messages[mid].created_at < timestamp) low = mid + 1;
+    else high = mid;
+  }
+  return low;
+}
+
+// Newest-first comparator. created_at is always a toISOString() value, so
+// string order is chronological and no Date parsing is needed per compare.
+// Ties break on id so every record has a fixed position a cursor can name.
+function newestFirst(a, b) {
+  if (a.created_at === b.created_at) {
+    if (a.id === b.id) return 0;
+    return a.id < b.id ? -1 : 1;
+  }
+  return a.created_at < b.created_at ? 1 : -1;
+}
+
+// First position in a newest-first list with created_at <= timestamp
+function newestFirstBound(records, timestamp) {
+  let low = 0;
+  let high = records.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (records[mid].created_at > timestamp) low = mid + 1;
+    else high = mid;
+  }
+  return low;
+}
 
 class DatabaseService {
   constructor() {
@@ -13,6 +78,13 @@ class DatabaseService {
     this.chatSessions = new Map();
     this.messages = new Map();
     this.voiceSessions = new Map();
+    // Lookup indexes so per-request reads don't scan every record
+    this.chatSessionIndex = new Map(); // documentId:sessionId -> Set<session>
+    this.documentSessionIndex = new Map(); // documentId -> Set<chat session>
+    this.voiceSessionIndex = new Map(); // documentId:sessionId -> Set<session>
+    this.sessionMessages = new Map(); // sessionId -> message[] (oldest first)
+    // Newest-first document listing, rebuilt only after inserts/deletes
+    this.sortedDocuments = null;
     this.messageId = 1;
     this.sessionId = 1;
     this.isInitialized = false;
@@ -43,8 +115,11 @@ class DatabaseService {
       wordCount,
       language,
       status,
+      vectorStatus,
+      chunkCount,
     } = documentData;
 
+    const now = new Date().toISOString();
     const document = {
       id,
       filename,
@@ -58,11 +133,14 @@ class DatabaseService {
       word_count: wordCount,
       language: language || "en",
       status: status || "uploaded",
-      created_at: new Date().toISOString(),
-      updated_at: new Date().toISOString(),
+      vector_status: vectorStatus || "pending",
+      chunk_count: chunkCount || 0,
+      created_at: now,
+      updated_at: now,
     };
 
     this.documents.set(id, document);
+    this.sortedDocuments = null;
     return id;
   }
 
@@ -70,73 +148,144 @@ class DatabaseService {
     return this.documents.get(documentId) || null;
   }
 
+  // Updates the stored record in place; returns false if there is none
   async updateDocumentStatus(documentId, status) {
     const document = this.documents.get(documentId);
-    if (document) {
-      document.status = status;
-      document.updated_at = new Date().toISOString();
-      this.documents.set(documentId, document);
+    if (!document) {
+      return false;
     }
+
+    document.status = status;
+    document.updated_at = new Date().toISOString();
+    return true;
+  }
+
+  async updateDocumentVectorStatus(documentId, vectorStatus, chunkCount) {
+    const document = this.documents.get(documentId);
+    if (!document) {
+      return false;
+    }
+
+    document.vector_status = vectorStatus;
+    document.chunk_count = chunkCount;
+    document.updated_at = new Date().toISOString();
+    return true;
+  }
+
+  getSortedDocuments() {
+    if (!this.sortedDocuments) {
+      this.sortedDocuments = Array.from(this.documents.values()).sort(
+        newestFirst,
+      );
+    }
+    return this.sortedDocuments;
   }
 
   async getAllDocuments() {
-    return Array.from(this.documents.values()).sort(
-      (a, b) => new Date(b.created_at) - new Date(a.created_at),
-    );
+    return this.getSortedDocuments().slice();
+  }
+
+  // Keyset page of the newest-first listing, resuming after the position
+  // { createdAt, id } of a decoded cursor (from the start when null). The
+  // cursor document itself doesn't have to exist any more.
+  async getDocumentsAfter(cursor, limit) {
+    const documents = this.getSortedDocuments();
+
+    let start = 0;
+    if (cursor) {
+      start = newestFirstBound(documents, cursor.createdAt);
+      while (
+        start < documents.length &&
+        documents[start].created_at === cursor.createdAt &&
+        documents[start].id <= cursor.id
+      ) {
+        start++;
+      }
+    }
+
+    return documents.slice(start, start + limit);
   }
 
   async getDocumentById(documentId) {
     return this.documents.get(documentId) || null;
   }
 
+  // Returns false if the document did not exist (nothing else to clean up:
+  // sessions and messages can only be created for an existing document)
   async deleteDocument(documentId) {
-    this.documents.delete(documentId);
+    if (!this.documents.delete(documentId)) {
+      return false;
+    }
+    this.sortedDocuments = null;
     // Also delete related sessions and messages
-    for (const [sessionId, session] of this.chatSessions.entries()) {
-      if (session.document_id === documentId) {
-        this.chatSessions.delete(sessionId);
-      }
+    for (const session of this.documentSessionIndex.get(documentId) || []) {
+      this.chatSessions.delete(session.id);
+      removeFromIndex(
+        this.chatSessionIndex,
+        sessionKey(documentId, session.session_id),
+        session,
+      );
     }
+    this.documentSessionIndex.delete(documentId);
     for (const [messageId, message] of this.messages.entries()) {
       if (message.document_id === documentId) {
         this.messages.delete(messageId);
       }
     }
+    for (const [sessionId, bucket] of this.sessionMessages.entries()) {
+      const remaining = bucket.filter((msg) => msg.document_id !== documentId);
+      if (remaining.length === 0) this.sessionMessages.delete(sessionId);
+      else this.sessionMessages.set(sessionId, remaining);
+    }
+    return true;
   }
 
   // Chat operations
+  // Idempotent per (documentId, sessionId): re-creating an existing session
+  // returns the stored row instead of adding a duplicate. Resolves to
+  // { session, created } so callers can tell the two cases apart.
   async createChatSession(sessionData) {
     const { id, documentId, sessionId, title } = sessionData;
 
+    const existing = firstInIndex(
+      this.chatSessionIndex,
+      sessionKey(documentId, sessionId),
+    );
+    if (existing) {
+      return { session: existing, created: false };
+    }
+
+    const now = new Date().toISOString();
     const session = {
       id,
       document_id: documentId,
       session_id: sessionId,
       title: title || `Chat Session ${this.sessionId++}`,
-      created_at: new Date().toISOString(),
-      updated_at: new Date().toISOString(),
+      created_at: now,
+      updated_at: now,
     };
 
     this.chatSessions.set(id, session);
-    return id;
+    addToIndex(
+      this.chatSessionIndex,
+      sessionKey(documentId, sessionId),
+      session,
+    );
+    addToIndex(this.documentSessionIndex, documentId, session);
+    return { session, created: true };
   }
 
   async getChatSession(documentId, sessionId) {
-    for (const session of this.chatSessions.values()) {
-      if (
-        session.document_id === documentId &&
-        session.session_id === sessionId
-      ) {
-        return session;
-      }
-    }
-    return null;
+    return firstInIndex(
+      this.chatSessionIndex,
+      sessionKey(documentId, sessionId),
+    );
   }
 
   async getChatSessionsByDocument(documentId) {
-    return Array.from(this.chatSessions.values())
-      .filter((session) => session.document_id === documentId)
-      .sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
+    return Array.from(this.documentSessionIndex.get(documentId) || []).sort(
+      newestFirst,
+    );
   }
 
   async saveChatMessage(messageData) {
@@ -149,29 +298,55 @@ class DatabaseService {
       document_id: documentId,
       message_type: messageType,
       content,
-      metadata: metadata || {},
+      metadata: metadata || EMPTY_METADATA,
       created_at: new Date().toISOString(),
     };
 
     this.messages.set(id, message);
+    const bucket = this.sessionMessages.get(sessionId);
+    if (bucket) bucket.push(message);
+    else this.sessionMessages.set(sessionId, [message]);
     return id;
   }
 
+  // Messages are indexed in insertion order, which is already chronological
   async getChatMessages(sessionId, limit = 50, offset = 0) {
-    const sessionMessages = Array.from(this.messages.values())
-      .filter((msg) => msg.session_id === sessionId)
-      .sort((a, b) => new Date(a.created_at) - new Date(b.created_at))
-      .slice(offset, offset + limit);
-
-    return sessionMessages;
+    const bucket = this.sessionMessages.get(sessionId);
+    if (!bucket) return [];
+    return bucket.slice(offset, offset + limit);
   }
 
   async getChatHistory(documentId, sessionId) {
-    return Array.from(this.messages.values())
-      .filter(
-        (msg) => msg.document_id === documentId && msg.session_id === sessionId,
-      )
-      .sort((a, b) => new Date(a.created_at) - new Date(b.created_at));
+    const bucket = this.sessionMessages.get(sessionId);
+    if (!bucket) return [];
+    return bucket.filter((msg) => msg.document_id === documentId);
+  }
+
+  // Keyset page: up to `limit` messages after the position { createdAt, id }
+  // of a decoded cursor (from the start when null). Messages keep insertion
+  // order, so within a millisecond the id only locates the cursor message
+  // while it still exists; once it's gone the page resumes after that
+  // millisecond instead.
+  async getChatHistoryAfter(documentId, sessionId, cursor, limit) {
+    const bucket = this.sessionMessages.get(sessionId);
+    if (!bucket) return [];
+
+    let start = 0;
+    if (cursor) {
+      start = lowerBound(bucket, cursor.createdAt);
+      while (
+        start < bucket.length &&
+        bucket[start].created_at === cursor.createdAt
+      ) {
+        if (bucket[start++].id === cursor.id) break;
+      }
+    }
+
+    const page = [];
+    for (let i = start; i < bucket.length && page.length < limit; i++) {
+      if (bucket[i].document_id === documentId) page.push(bucket[i]);
+    }
+    return page;
   }
 
   async deleteChatSession(sessionId) {
@@ -179,78 +354,116 @@ class DatabaseService {
     for (const [id, session] of this.chatSessions.entries()) {
       if (session.session_id === sessionId) {
         this.chatSessions.delete(id);
+        removeFromIndex(
+          this.chatSessionIndex,
+          sessionKey(session.document_id, sessionId),
+          session,
+        );
+        removeFromIndex(
+          this.documentSessionIndex,
+          session.document_id,
+          session,
+        );
         break;
       }
     }
 
     // Delete related messages
-    for (const [messageId, message] of this.messages.entries()) {
-      if (message.session_id === sessionId) {
-        this.messages.delete(messageId);
+    const bucket = this.sessionMessages.get(sessionId);
+    if (bucket) {
+      for (const message of bucket) {
+        this.messages.delete(message.id);
       }
+      this.sessionMessages.delete(sessionId);
     }
   }
 
   async deleteChatHistory(documentId, sessionId) {
-    for (const [messageId, message] of this.messages.entries()) {
-      if (
-        message.document_id === documentId &&
-        message.session_id === sessionId
-      ) {
-        this.messages.delete(messageId);
+    const bucket = this.sessionMessages.get(sessionId);
+    if (!bucket) return;
+    const remaining = [];
+    for (const message of bucket) {
+      if (message.document_id === documentId) {
+        this.messages.delete(message.id);
+      } else {
+        remaining.push(message);
       }
     }
+    if (remaining.length === 0) this.sessionMessages.delete(sessionId);
+    else this.sessionMessages.set(sessionId, remaining);
   }
 
   // Voice operations
   async createVoiceSession(sessionData) {
     const { id, documentId, sessionId } = sessionData;
 
+    const now = new Date().toISOString();
     const session = {
       id,
       document_id: documentId,
       session_id: sessionId,
       transcriptions: [],
       responses: [],
-      created_at: new Date().toISOString(),
-      updated_at: new Date().toISOString(),
+      created_at: now,
+      updated_at: now,
     };
 
     this.voiceSessions.set(id, session);
+    addToIndex(
+      this.voiceSessionIndex,
+      sessionKey(documentId, sessionId),
+      session,
+    );
     return id;
   }
 
-  async getVoiceSession(documentId, sessionId) {
-    for (const session of this.voiceSessions.values()) {
-      if (
-        session.document_id === documentId &&
-        session.session_id === sessionId
-      ) {
-        return session;
-      }
+  // One index lookup, and the created session is returned directly rather
+  // than re-read after insert
+  async getOrCreateVoiceSession(id, documentId, sessionId) {
+    const existing = firstInIndex(
+      this.voiceSessionIndex,
+      sessionKey(documentId, sessionId),
+    );
+    if (existing) {
+      return existing;
     }
-    return null;
+
+    await this.createVoiceSession({ id, documentId, sessionId });
+    return this.voiceSessions.get(id);
+  }
+
+  async getVoiceSession(documentId, sessionId) {
+    return firstInIndex(
+      this.voiceSessionIndex,
+      sessionKey(documentId, sessionId),
+    );
   }
 
   async updateVoiceSession(documentId, sessionId, transcriptions, responses) {
-    for (const [id, session] of this.voiceSessions.entries()) {
-      if (
-        session.document_id === documentId &&
-        session.session_id === sessionId
-      ) {
-        session.transcriptions = transcriptions;
-        session.responses = responses;
-        session.updated_at = new Date().toISOString();
-        this.voiceSessions.set(id, session);
-        break;
-      }
+    const session = firstInIndex(
+      this.voiceSessionIndex,
+      sessionKey(documentId, sessionId),
+    );
+    if (!session) {
+      return false;
     }
+
+    // The indexed object is the stored one, so update it in place
+    session.transcriptions = transcriptions;
+    session.responses = responses;
+    session.updated_at = new Date().toISOString();
+    return true;
   }
 
   async deleteVoiceSession(sessionId) {
     for (const [id, session] of this.voiceSessions.entries()) {
       if (session.session_id === sessionId) {
         this.voiceSessions.delete(id);
+        removeFromIndex(
+          this.voiceSessionIndex,
+          sessionKey(session.document_id, sessionId),
+          session,
+        );
         break;
       }
     }
@@ -1,7 +1,7 @@
 import fs from "fs/promises";
 import path from "path";
 import { v4 as uuidv4 } from "uuid";
-import winston from "winston";
+import rootLogger from "../utils/logger.js";
 import pdfParse from 'pdf-parse';
 import mammoth from 'mammoth';
 import { encoding_for_model } from 'tiktoken';
@@ -9,11 +9,55 @@ import databaseService from "./databaseService.js";
 import embeddingService from "./embeddingService.js";
 import qdrantService from "./qdrantService.js";
 
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "document-processor" },
-});
+const logger = rootLogger.child({ module: "document-processor" });
+
+// Limits read once at load (.env is loaded before any service module)
+const MAX_FILE_SIZE_MB = parseInt(process.env.MAX_FILE_SIZE_MB) || 50;
+const MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024;
+const BATCH_PROCESSING_CONCURRENCY =
+  parseInt(process.env.BATCH_PROCESSING_CONCURRENCY) || 3;
+
+// Document type for each accepted upload MIME type
+const DOCUMENT_TYPES = new Map([
+  ["application/pdf", "pdf"],
+  ["application/msword", "document"],
+  ["application/vnd.openxmlformats-officedocument.wordprocessingml.document", "document"],
+  ["text/plain", "text"],
+]);
+
+// MIME types accepted by validateFile
+const VALIDATED_FILE_TYPES = new Set([
+  "application/pdf",
+  "application/msword",
+  "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+  "text/plain",
+]);
+
+// Text extractor method for each accepted upload MIME type
+const TEXT_EXTRACTORS = new Map([
+  ["text/plain", "extractTextFromTXT"],
+  ["application/pdf", "extractTextFromPDF"],
+  ["application/msword", "extractTextFromDOCX"],
+  ["application/vnd.openxmlformats-officedocument.wordprocessingml.document", "extractTextFromDOCX"],
+  ["image/jpeg", "extractTextFromImage"],
+  ["image/jpg", "extractTextFromImage"],
+  ["image/png", "extractTextFromImage"],
+  ["image/gif", "extractTextFromImage"],
+  ["image/bmp", "extractTextFromImage"],
+]);
+
+// Whitespace runs (captured) collapse to one space; other control
+// characters are dropped
+const CLEAN_TEXT_REGEX = /(\s+)|[\x00-\x1F\x7F-\x9F]/g;
+
+// Same set of characters as \s; ASCII and Latin-1 are checked directly and
+// only the rare code points above that fall back to the regex
+function isWhitespaceCode(code) {
+  if (code <= 0xff) {
+    return code === 32 || (code >= 9 && code <= 13) || code === 0xa0;
+  }
+  return /\s/.test(String.fromCharCode(code));
+}
 
 class DocumentProcessor {
   constructor() {
@@ -50,15 +94,8 @@ class DocumentProcessor {
       // Save file locally
       const uploadResult = await this.saveFileLocally(file, documentId);
 
-      // Process text for RAG
-      const ragResult = await this.processForRAG(documentId, extractionResult.text, {
-        filename: file.originalname,
-        userId: options.userId,
-        documentType: this.getDocumentType(file.mimetype),
-        ...extractionResult.metadata
-      });
-
       const processingTime = Date.now() - startTime;
+      const wordCount = this.countWords(extractionResult.text);
 
       const result = {
         documentId,
@@ -69,9 +106,9 @@ class DocumentProcessor {
         extractedText: extractionResult.text,
         confidence: extractionResult.confidence,
         pages: extractionResult.pages || 1,
-        wordCount: this.countWords(extractionResult.text),
+        wordCount,
         processingTime,
-        ragProcessing: ragResult,
+        ragProcessing: { status: "pending" },
         metadata: {
           language: "en",
           encoding: "UTF-8",
@@ -91,11 +128,20 @@ class DocumentProcessor {
         extractedText: extractionResult.text,
         confidence: extractionResult.confidence,
         pages: extractionResult.pages || 1,
-        wordCount: this.countWords(extractionResult.text),
+        wordCount,
         language: "en",
         status: "processed",
-        vectorStatus: ragResult.success ? "vectorized" : "failed",
-        chunkCount: ragResult.chunkCount || 0
+        vectorStatus: "pending",
+        chunkCount: 0
+      });
+
+      // Chunking, embedding and vector storage run after the response; until
+      // they finish, RAG queries fall back to the stored extracted text
+      this.vectorizeInBackground(documentId, extractionResult.text, {
+        filename: file.originalname,
+        userId: options.userId,
+        documentType: this.getDocumentType(file.mimetype),
+        ...extractionResult.metadata
       });
 
       logger.info(`Document processed successfully: ${documentId} in ${processingTime}ms`);
@@ -106,6 +152,20 @@ class DocumentProcessor {
     }
   }
 
+  // Run RAG processing off the request path and record the outcome
+  vectorizeInBackground(documentId, text, metadata) {
+    this.processForRAG(documentId, text, metadata)
+      .then((ragResult) => databaseService.updateDocumentVectorStatus(
+        documentId,
+        ragResult.success ? "vectorized" : "failed",
+        ragResult.chunkCount || 0
+      ))
+      .catch((error) => {
+        logger.error(`Background vectorization failed for ${documentId}:`, error);
+        return databaseService.updateDocumentVectorStatus(documentId, "failed", 0);
+      });
+  }
+
   // Process document for RAG (chunking and vectorization)
   async processForRAG(documentId, text, metadata = {}) {
     try {
@@ -174,14 +234,16 @@ class DocumentProcessor {
   // Store document vectors in Qdrant
   async storeDocumentVectorsInQdrant(documentId, chunks, embeddings, metadata) {
     try {
-      let storedCount = 0;
+      const vectors = [];
+      // One timestamp for the whole batch, so every chunk shares it
+      const createdAt = new Date().toISOString();
       
       for (let i = 0; i < chunks.length; i++) {
         const chunk = chunks[i];
         const embedding = embeddings[i];
         
         if (embedding && embedding.embedding) {
-          const vectorData = {
+          vectors.push({
             id: `${documentId}_chunk_${i}`,
             vector: embedding.embedding,
             metadata: {
@@ -189,17 +251,15 @@ class DocumentProcessor {
               chunkIndex: i,
               content: chunk,
               ...metadata,
-              createdAt: new Date().toISOString()
+              createdAt
             }
-          };
-          
-          const success = await qdrantService.upsertVector(vectorData);
-          if (success) {
-            storedCount++;
-          }
+          });
         }
       }
       
+      // One round-trip for the whole document instead of one per chunk
+      const storedCount = await qdrantService.upsertVectors(vectors);
+      
       return {
         success: storedCount > 0,
         storedCount,
@@ -222,17 +282,12 @@ class DocumentProcessor {
       const buffer = file.buffer;
       const mimeType = file.mimetype;
 
-      if (mimeType === "text/plain") {
-        return await this.extractTextFromTXT(buffer);
-      } else if (mimeType === "application/pdf") {
-        return await this.extractTextFromPDF(buffer);
-      } else if (mimeType.includes("word") || mimeType.includes("document")) {
-        return await this.extractTextFromDOCX(buffer);
-      } else if (mimeType.startsWith("image/")) {
-        return await this.extractTextFromImage(buffer);
-      } else {
+      const extractor = TEXT_EXTRACTORS.get(mimeType);
+      if (!extractor) {
         throw new Error(`Unsupported file type: ${mimeType}`);
       }
+
+      return await this[extractor](buffer);
     } catch (error) {
       logger.error("Text extraction failed:", error);
       throw error;
@@ -308,10 +363,9 @@ class DocumentProcessor {
   cleanText(text) {
     if (!text) return '';
     
+    // Collapse whitespace and strip control characters in a single pass
     return text
-      .replace(/\s+/g, ' ')
-      .replace(/[\x00-\x1F\x7F-\x9F]/g, '')
-      .replace(/\n\s*\n/g, '\n')
+      .replace(CLEAN_TEXT_REGEX, (match, whitespace) => (whitespace ? ' ' : ''))
       .trim();
   }
 
@@ -466,27 +520,18 @@ class DocumentProcessor {
 
   // Validate uploaded file
   validateFile(file) {
-    const maxSize = (parseInt(process.env.MAX_FILE_SIZE_MB) || 50) * 1024 * 1024;
-
     if (!file) {
       return { isValid: false, error: "No file provided" };
     }
 
-    if (file.size > maxSize) {
+    if (file.size > MAX_FILE_SIZE) {
       return {
         isValid: false,
-        error: `File size exceeds maximum allowed size of ${process.env.MAX_FILE_SIZE_MB || 50}MB`,
+        error: `File size exceeds maximum allowed size of ${MAX_FILE_SIZE_MB}MB`,
       };
     }
 
-    const allowedTypes = [
-      "application/pdf",
-      "application/msword",
-      "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-      "text/plain"
-    ];
-
-    if (!allowedTypes.includes(file.mimetype)) {
+    if (!VALIDATED_FILE_TYPES.has(file.mimetype)) {
       return {
         isValid: false,
         error: `Unsupported file type: ${file.mimetype}`,
@@ -523,21 +568,27 @@ class DocumentProcessor {
     }
   }
 
-  // Count words in text
+  // Count words (runs of non-whitespace) in one scan, without splitting the
+  // whole extracted text into an array first
   countWords(text) {
     if (!text || typeof text !== "string") return 0;
-    return text
-      .trim()
-      .split(/\s+/)
-      .filter((word) => word.length > 0).length;
+
+    let count = 0;
+    let inWord = false;
+    for (let i = 0; i < text.length; i++) {
+      if (isWhitespaceCode(text.charCodeAt(i))) {
+        inWord = false;
+      } else if (!inWord) {
+        inWord = true;
+        count++;
+      }
+    }
+    return count;
   }
 
   // Get document type
   getDocumentType(mimeType) {
-    if (mimeType.includes('pdf')) return 'pdf';
-    if (mimeType.includes('word') || mimeType.includes('document')) return 'document';
-    if (mimeType.includes('text')) return 'text';
-    return 'other';
+    return DOCUMENT_TYPES.get(mimeType) || 'other';
   }
 
   // Process multiple documents
@@ -549,16 +600,38 @@ class DocumentProcessor {
       successRate: 0,
     };
 
-    for (const file of files) {
-      try {
-        const result = await this.processDocument(file, options);
-        results.successful.push(result);
-      } catch (error) {
-        results.failed.push({
-          fileName: file.originalname,
-          error: error.message,
-        });
+    // Process a few files at a time. Each one is text extraction plus a disk
+    // write; vectorization is handed to vectorizeInBackground and not
+    // awaited, so it is outside this limit: a batch upload (at most 5 files)
+    // starts up to 5 processForRAG runs at once
+    const outcomes = new Array(files.length);
+    let next = 0;
+
+    const worker = async () => {
+      while (next < files.length) {
+        const index = next++;
+        const file = files[index];
+        try {
+          outcomes[index] = { result: await this.processDocument(file, options) };
+        } catch (error) {
+          outcomes[index] = {
+            failure: { fileName: file.originalname, error: error.message },
+          };
+        }
       }
+    };
+
+    await Promise.all(
+      Array.from(
+        { length: Math.min(BATCH_PROCESSING_CONCURRENCY, files.length) },
+        worker,
+      ),
+    );
+
+    // Keep results in upload order
+    for (const outcome of outcomes) {
+      if (outcome.result) results.successful.push(outcome.result);
+      else results.failed.push(outcome.failure);
     }
 
     results.successRate = results.successful.length / results.totalProcessed;
@@ -575,10 +648,10 @@ class DocumentProcessor {
 
       return {
         status: document.status,
-        vectorStatus: document.vectorStatus || 'unknown',
+        vectorStatus: document.vector_status || 'unknown',
         progress: document.status === "processed" ? 100 : 0,
         message: `Document is ${document.status}`,
-        chunkCount: document.chunkCount || 0
+        chunkCount: document.chunk_count || 0
       };
     } catch (error) {
       return { status: "error", message: error.message };
@@ -601,17 +674,13 @@ class DocumentProcessor {
 // Export singleton instance
 const documentProcessor = new DocumentProcessor();
 
-// Legacy function exports for compatibility
-export async function processDocument(file, options = {}) {
-  return documentProcessor.processDocument(file, options);
-}
-
-export async function processDocuments(files, options = {}) {
-  return documentProcessor.processDocuments(files, options);
-}
-
-export async function getProcessingStatus(documentId) {
-  return documentProcessor.getProcessingStatus(documentId);
-}
+// Legacy function exports for compatibility; bound methods rather than
+// wrappers, so calls go straight to the singleton without an extra frame
+export const processDocument =
+  documentProcessor.processDocument.bind(documentProcessor);
+export const processDocuments =
+  documentProcessor.processDocuments.bind(documentProcessor);
+export const getProcessingStatus =
+  documentProcessor.getProcessingStatus.bind(documentProcessor);
 
 export default documentProcessor;
\ No newline at end of file
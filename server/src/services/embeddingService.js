@@ -1,9 +1,23 @@
+import { createHash } from 'crypto';
 import logger from '../utils/logger.js';
+import { isRetryableError, withRetry } from '../utils/retry.js';
+
+// Maximum number of texts per provider batch request (Gemini's limit)
+const EMBEDDING_BATCH_SIZE = 100;
+
+// Provider batch requests allowed in flight at once for a single call
+const EMBEDDING_BATCH_CONCURRENCY =
+  parseInt(process.env.EMBEDDING_BATCH_CONCURRENCY) || 3;
+
+const EMBEDDING_CACHE_MAX_SIZE = 1000;
+
+const OPENAI_EMBEDDING_MODEL = process.env.EMBEDDING_MODEL || 'text-embedding-3-small';
 
 class EmbeddingService {
   constructor() {
     this.geminiClient = null;
     this.openaiClient = null;
+    this.geminiEmbeddingModel = null;
     this.initialized = false;
     this.cache = new Map();
     
@@ -75,8 +89,9 @@ class EmbeddingService {
     }
 
     const cacheKey = `embedding_${this.hashString(text)}`;
-    if (this.cache.has(cacheKey)) {
-      return this.cache.get(cacheKey);
+    const cached = this.getCachedEmbedding(cacheKey);
+    if (cached) {
+      return cached;
     }
 
     let embedding;
@@ -88,25 +103,51 @@ class EmbeddingService {
     }
 
     if (embedding) {
-      this.cache.set(cacheKey, embedding);
-      
-      // Limit cache size
-      if (this.cache.size > 1000) {
-        const firstKey = this.cache.keys().next().value;
-        this.cache.delete(firstKey);
-      }
+      this.cacheEmbedding(cacheKey, embedding);
     }
 
     return embedding;
   }
 
-  async generateGeminiEmbedding(text) {
-    try {
-      const model = this.geminiClient.getGenerativeModel({ 
+  // LRU lookup: a hit moves the entry to the back of the Map's insertion order
+  getCachedEmbedding(cacheKey) {
+    const embedding = this.cache.get(cacheKey);
+    if (embedding) {
+      this.cache.delete(cacheKey);
+      this.cache.set(cacheKey, embedding);
+    }
+    return embedding;
+  }
+
+  cacheEmbedding(cacheKey, embedding) {
+    this.cache.delete(cacheKey);
+    this.cache.set(cacheKey, embedding);
+    
+    // Limit cache size by evicting the least recently used entry
+    if (this.cache.size > EMBEDDING_CACHE_MAX_SIZE) {
+      const firstKey = this.cache.keys().next().value;
+      this.cache.delete(firstKey);
+    }
+  }
+
+  // Created on first use and reused for every embedding request
+  getGeminiEmbeddingModel() {
+    if (!this.geminiEmbeddingModel) {
+      this.geminiEmbeddingModel = this.geminiClient.getGenerativeModel({ 
         model: 'text-embedding-004' 
       });
+    }
+    return this.geminiEmbeddingModel;
+  }
+
+  async generateGeminiEmbedding(text) {
+    try {
+      const model = this.getGeminiEmbeddingModel();
       
-      const result = await model.embedContent(text);
+      const result = await withRetry(
+        () => model.embedContent(text),
+        { label: 'Gemini embedding' }
+      );
       const embedding = result.embedding;
       
       if (!embedding?.values) {
@@ -122,29 +163,88 @@ class EmbeddingService {
       };
     } catch (error) {
       logger.error('Gemini embedding generation failed:', error);
-      throw new Error(`Gemini embedding failed: ${error.message}`);
+      throw new Error(`Gemini embedding failed: ${error.message}`, { cause: error });
     }
   }
   
 
+  async generateGeminiEmbeddings(texts) {
+    try {
+      const model = this.getGeminiEmbeddingModel();
+      
+      const result = await withRetry(
+        () => model.batchEmbedContents({
+          requests: texts.map(text => ({
+            content: { role: 'user', parts: [{ text }] }
+          }))
+        }),
+        { label: 'Gemini batch embedding' }
+      );
+      
+      if (result.embeddings?.length !== texts.length) {
+        throw new Error('Invalid batch embedding response from Gemini');
+      }
+      
+      return result.embeddings.map(embedding => ({
+        embedding: embedding.values,
+        dimensions: embedding.values.length,
+        model: 'text-embedding-004',
+        provider: 'gemini'
+      }));
+    } catch (error) {
+      logger.error('Gemini batch embedding generation failed:', error);
+      throw new Error(`Gemini batch embedding failed: ${error.message}`, { cause: error });
+    }
+  }
+
   async generateOpenAIEmbedding(text) {
     try {
-      const response = await this.openaiClient.embeddings.create({
-        model: process.env.EMBEDDING_MODEL || 'text-embedding-3-small',
-        input: text,
-      });
+      const response = await withRetry(
+        () => this.openaiClient.embeddings.create({
+          model: OPENAI_EMBEDDING_MODEL,
+          input: text,
+        }),
+        { label: 'OpenAI embedding' }
+      );
 
       const embedding = response.data[0].embedding;
       
       return {
         embedding,
         dimensions: embedding.length,
-        model: process.env.EMBEDDING_MODEL || 'text-embedding-3-small',
+        model: OPENAI_EMBEDDING_MODEL,
         provider: 'openai'
       };
     } catch (error) {
       logger.error('OpenAI embedding generation failed:', error);
-      throw new Error(`OpenAI embedding failed: ${error.message}`);
+      throw new Error(`OpenAI embedding failed: ${error.message}`, { cause: error });
+    }
+  }
+
+  async generateOpenAIEmbeddings(texts) {
+    try {
+      const response = await withRetry(
+        () => this.openaiClient.embeddings.create({
+          model: OPENAI_EMBEDDING_MODEL,
+          input: texts,
+        }),
+        { label: 'OpenAI batch embedding' }
+      );
+
+      // Results carry their input index; don't rely on response order
+      const embeddings = new Array(texts.length);
+      for (const item of response.data) {
+        embeddings[item.index] = {
+          embedding: item.embedding,
+          dimensions: item.embedding.length,
+          model: OPENAI_EMBEDDING_MODEL,
+          provider: 'openai'
+        };
+      }
+      return embeddings;
+    } catch (error) {
+      logger.error('OpenAI batch embedding generation failed:', error);
+      throw new Error(`OpenAI batch embedding failed: ${error.message}`, { cause: error });
     }
   }
 
@@ -155,21 +255,86 @@ class EmbeddingService {
       throw new Error('No embedding providers available - check API keys');
     }
 
-    const embeddings = [];
-    
-    for (const text of texts) {
-      try {
-        const embedding = await this.generateEmbedding(text);
-        embeddings.push(embedding);
-      } catch (error) {
-        logger.error(`Failed to generate embedding for text: ${text.substring(0, 100)}...`, error);
-        embeddings.push(null);
+    const embeddings = new Array(texts.length).fill(null);
+    // Cache misses keyed by text hash, so repeated texts (boilerplate
+    // clauses, headers) are embedded once and fanned out to every index
+    const pendingByKey = new Map();
+
+    texts.forEach((text, index) => {
+      const cacheKey = `embedding_${this.hashString(text)}`;
+      const cached = this.getCachedEmbedding(cacheKey);
+      if (cached) {
+        embeddings[index] = cached;
+      } else if (pendingByKey.has(cacheKey)) {
+        pendingByKey.get(cacheKey).indexes.push(index);
+      } else {
+        pendingByKey.set(cacheKey, { text, indexes: [index], cacheKey });
       }
+    });
+    const pending = [...pendingByKey.values()];
+
+    // Embed cache misses with one provider request per batch instead of per
+    // text, keeping a few batches in flight so large documents don't wait on
+    // each round-trip in turn
+    const batches = [];
+    for (let i = 0; i < pending.length; i += EMBEDDING_BATCH_SIZE) {
+      batches.push(pending.slice(i, i + EMBEDDING_BATCH_SIZE));
     }
 
+    let next = 0;
+    const worker = async () => {
+      while (next < batches.length) {
+        await this.embedPendingBatch(batches[next++], embeddings);
+      }
+    };
+
+    await Promise.all(
+      Array.from(
+        { length: Math.min(EMBEDDING_BATCH_CONCURRENCY, batches.length) },
+        worker
+      )
+    );
+
     return embeddings;
   }
 
+  // Embeds one batch of cache misses into `embeddings`, falling back to
+  // per-text requests if the batch request fails. A batch that still failed
+  // with a rate-limit or overload error after its retries is left unembedded
+  // (null) instead: one request per text would only add to the load.
+  async embedPendingBatch(batch, embeddings) {
+    const batchTexts = batch.map(item => item.text);
+
+    try {
+      const results = this.geminiClient
+        ? await this.generateGeminiEmbeddings(batchTexts)
+        : await this.generateOpenAIEmbeddings(batchTexts);
+
+      batch.forEach((item, j) => {
+        if (results[j]) {
+          item.indexes.forEach(index => { embeddings[index] = results[j]; });
+          this.cacheEmbedding(item.cacheKey, results[j]);
+        }
+      });
+    } catch (error) {
+      if (isRetryableError(error)) {
+        logger.warn(`Batch embedding failed after retries, skipping ${batch.length} texts: ${error.message}`);
+        return;
+      }
+
+      logger.warn(`Batch embedding failed, falling back to per-text requests: ${error.message}`);
+
+      for (const item of batch) {
+        try {
+          const embedding = await this.generateEmbedding(item.text);
+          item.indexes.forEach(index => { embeddings[index] = embedding; });
+        } catch (error) {
+          logger.error(`Failed to generate embedding for text: ${item.text.substring(0, 100)}...`, error);
+        }
+      }
+    }
+  }
+
   chunkText(text, chunkSize = 1000, overlap = 200) {
     if (!text || typeof text !== 'string') {
       return [];
@@ -208,17 +373,10 @@ class EmbeddingService {
     return chunks;
   }
 
+  // Collision-resistant cache key: a 32-bit rolling hash could hand back
+  // another text's embedding once the cache holds enough entries
   hashString(str) {
-    let hash = 0;
-    if (str.length === 0) return hash;
-    
-    for (let i = 0; i < str.length; i++) {
-      const char = str.charCodeAt(i);
-      hash = ((hash << 5) - hash) + char;
-      hash = hash & hash;
-    }
-    
-    return hash.toString();
+    return createHash('sha256').update(str).digest('base64');
   }
 
   clearCache() {
@@ -229,7 +387,7 @@ class EmbeddingService {
   getCacheStats() {
     return {
       size: this.cache.size,
-      maxSize: 1000
+      maxSize: EMBEDDING_CACHE_MAX_SIZE
     };
   }
 
@@ -4,14 +4,10 @@ import speech from "@google-cloud/speech";
 import textToSpeech from "@google-cloud/text-to-speech";
 import { Firestore } from "@google-cloud/firestore";
 import { Storage } from "@google-cloud/storage";
-import winston from "winston";
+import rootLogger from "../utils/logger.js";
 
 // Initialize logger
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "google-cloud-service" },
-});
+const logger = rootLogger.child({ module: "google-cloud-service" });
 
 // Google Cloud clients
 let vertexAI;
@@ -21,6 +17,18 @@ let ttsClient;
 let firestore;
 let storage;
 
+// Process-local cache of Firestore analyses; every analysis route re-reads
+// the same document, and analyses only change through saveDocumentAnalysis
+const analysisCache = new Map();
+const ANALYSIS_CACHE_TTL_MS =
+  parseInt(process.env.ANALYSIS_CACHE_TTL_MS) || 5 * 60 * 1000;
+const ANALYSIS_CACHE_MAX_ENTRIES = 500;
+
+// Bumped by every saveDocumentAnalysis; a Firestore read only fills the
+// cache if no save landed while it was in flight, so a refresh that started
+// before a re-analysis can't put the old analysis back
+const analysisGenerations = new Map();
+
 // Initialize all Google Cloud services
 export async function initializeGoogleCloud() {
   try {
@@ -97,20 +105,29 @@ async function testConnections() {
 }
 
 // Vertex AI - Gemini Model
+// Model handles are stateless, so build one per model name and reuse it
+const vertexModels = new Map();
+
 export async function getVertexAIModel(modelName = "gemini-1.5-flash") {
   if (!vertexAI) {
     throw new Error("Vertex AI not initialized");
   }
 
-  return vertexAI.getGenerativeModel({
-    model: modelName,
-    generationConfig: {
-      maxOutputTokens: parseInt(process.env.MAX_TOKENS) || 4096,
-      temperature: parseFloat(process.env.TEMPERATURE) || 0.3,
-      topP: 0.8,
-      topK: 40,
-    },
-  });
+  let model = vertexModels.get(modelName);
+  if (!model) {
+    model = vertexAI.getGenerativeModel({
+      model: modelName,
+      generationConfig: {
+        maxOutputTokens: parseInt(process.env.MAX_TOKENS) || 4096,
+        temperature: parseFloat(process.env.TEMPERATURE) || 0.3,
+        topP: 0.8,
+        topK: 40,
+      },
+    });
+    vertexModels.set(modelName, model);
+  }
+
+  return model;
 }
 
 // Vision API - OCR and Document Analysis
@@ -268,6 +285,11 @@ export async function saveDocumentAnalysis(documentId, analysis) {
         updatedAt: new Date(),
       });
 
+    analysisGenerations.set(
+      documentId,
+      (analysisGenerations.get(documentId) || 0) + 1,
+    );
+    analysisCache.delete(documentId);
     return documentId;
   } catch (error) {
     logger.error("Error saving document analysis:", error);
@@ -275,21 +297,73 @@ export async function saveDocumentAnalysis(documentId, analysis) {
   }
 }
 
-export async function getDocumentAnalysis(documentId) {
-  try {
-    const doc = await firestore
-      .collection("document-analyses")
-      .doc(documentId)
-      .get();
+async function fetchDocumentAnalysis(documentId) {
+  const generation = analysisGenerations.get(documentId) || 0;
+  const doc = await firestore
+    .collection("document-analyses")
+    .doc(documentId)
+    .get();
+  const stale = generation !== (analysisGenerations.get(documentId) || 0);
+
+  if (!doc.exists) {
+    if (!stale) analysisCache.delete(documentId);
+    return null;
+  }
+
+  const analysis = {
+    id: doc.id,
+    ...doc.data(),
+  };
+
+  // A save finished while this read was in flight: the data may predate it,
+  // so hand it to this caller only and leave the cache to the next read
+  if (stale) {
+    return analysis;
+  }
+
+  if (
+    !analysisCache.has(documentId) &&
+    analysisCache.size >= ANALYSIS_CACHE_MAX_ENTRIES
+  ) {
+    analysisCache.delete(analysisCache.keys().next().value);
+  }
+  analysisCache.set(documentId, {
+    analysis,
+    expiresAt: Date.now() + ANALYSIS_CACHE_TTL_MS,
+    refreshing: null,
+  });
+
+  return analysis;
+}
+
+// Stale-while-revalidate: an expired entry is still served immediately while
+// a single background read refreshes it; if that read fails, the stale copy
+// stays in place until the next request tries again
+function refreshDocumentAnalysis(documentId, entry) {
+  if (entry.refreshing) {
+    return;
+  }
 
-    if (!doc.exists) {
-      return null;
+  entry.refreshing = fetchDocumentAnalysis(documentId)
+    .catch((error) => {
+      logger.warn("Background analysis refresh failed:", error.message);
+    })
+    .finally(() => {
+      entry.refreshing = null;
+    });
+}
+
+export async function getDocumentAnalysis(documentId) {
+  const cached = analysisCache.get(documentId);
+  if (cached) {
+    if (cached.expiresAt <= Date.now()) {
+      refreshDocumentAnalysis(documentId, cached);
     }
+    return cached.analysis;
+  }
 
-    return {
-      id: doc.id,
-      ...doc.data(),
-    };
+  try {
+    return await fetchDocumentAnalysis(documentId);
   } catch (error) {
     logger.error("Error getting document analysis:", error);
     throw error;
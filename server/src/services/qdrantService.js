@@ -1,6 +1,14 @@
 import { QdrantClient } from '@qdrant/js-client-rest';
 import logger from '../utils/logger.js';
 
+// Convert string ID to integer for Qdrant
+function toPointId(id) {
+  return Math.abs(id.split('').reduce((a, b) => {
+    a = ((a << 5) - a) + b.charCodeAt(0);
+    return a & a;
+  }, 0));
+}
+
 class QdrantService {
   constructor() {
     this.client = null;
@@ -36,6 +44,15 @@ class QdrantService {
       return;
     }
 
+    // One client for the process so its HTTP connections are reused;
+    // only the connectivity probe below is retried
+    this.client = new QdrantClient({
+      url: url,
+      apiKey: apiKey,
+      checkCompatibility: false, // Skip version check for cloud instances
+      timeout: 15000 // Increased timeout
+    });
+
     // Retry connection logic
     const maxRetries = 3;
     let retryCount = 0;
@@ -43,13 +60,6 @@ class QdrantService {
     while (retryCount < maxRetries) {
       try {
         logger.info(`Connecting to Qdrant... (attempt ${retryCount + 1}/${maxRetries})`);
-        
-        this.client = new QdrantClient({
-          url: url,
-          apiKey: apiKey,
-          checkCompatibility: false, // Skip version check for cloud instances
-          timeout: 15000 // Increased timeout
-        });
 
         // Test connection by getting collections info
         await this.client.getCollections();
@@ -99,6 +109,15 @@ class QdrantService {
           vectors: {
             size: this.vectorSize,
             distance: 'Cosine'
+          },
+          // int8 scalar quantization: 4x less vector memory for search, with
+          // original vectors kept for rescoring the top candidates
+          quantization_config: {
+            scalar: {
+              type: 'int8',
+              quantile: 0.99,
+              always_ram: true
+            }
           }
         });
         
@@ -106,12 +125,30 @@ class QdrantService {
       } else {
         logger.info(`✅ Collection '${this.collectionName}' already exists`);
       }
+
+      await this.ensurePayloadIndexes();
     } catch (error) {
       logger.error('Failed to ensure collection:', error.message);
       // Don't throw error - allow server to continue
     }
   }
 
+  // Index the payload keys used in search filters so filtered searches
+  // don't have to check every candidate point's payload
+  async ensurePayloadIndexes() {
+    for (const fieldName of ['documentId', 'userId']) {
+      try {
+        await this.client.createPayloadIndex(this.collectionName, {
+          field_name: fieldName,
+          field_schema: 'keyword',
+          wait: true
+        });
+      } catch (error) {
+        logger.warn(`Failed to create payload index on '${fieldName}':`, error.message);
+      }
+    }
+  }
+
   async upsertVector(vectorData) {
     if (!this.isAvailable()) {
       return false;
@@ -120,17 +157,11 @@ class QdrantService {
     try {
       const { id, vector, metadata } = vectorData;
       
-      // Convert string ID to integer for Qdrant
-      const numericId = Math.abs(id.split('').reduce((a, b) => {
-        a = ((a << 5) - a) + b.charCodeAt(0);
-        return a & a;
-      }, 0));
-      
       // Add timeout to prevent hanging
       const upsertPromise = this.client.upsert(this.collectionName, {
         wait: true,
         points: [{
-          id: numericId,
+          id: toPointId(id),
           vector: vector,
           payload: metadata
         }]
@@ -155,7 +186,42 @@ class QdrantService {
     }
   }
 
-  async searchSimilarVectors(queryVector, limit = 5, scoreThreshold = 0.7, filter = null) {
+  // Upsert many vectors in a single request; returns the number stored
+  async upsertVectors(vectors) {
+    if (!this.isAvailable() || vectors.length === 0) {
+      return 0;
+    }
+
+    try {
+      const upsertPromise = this.client.upsert(this.collectionName, {
+        wait: true,
+        points: vectors.map(({ id, vector, metadata }) => ({
+          id: toPointId(id),
+          vector: vector,
+          payload: metadata
+        }))
+      });
+
+      const timeoutPromise = new Promise((_, reject) => 
+        setTimeout(() => reject(new Error('Upsert timeout')), 30000)
+      );
+
+      await Promise.race([upsertPromise, timeoutPromise]);
+
+      logger.debug(`Upserted ${vectors.length} vectors`);
+      return vectors.length;
+    } catch (error) {
+      logger.error('Failed to upsert vectors:', {
+        message: error.message,
+        count: vectors.length,
+        collectionName: this.collectionName
+      });
+      return 0;
+    }
+  }
+
+  // payloadFields: list of payload keys to return, or true for the whole payload
+  async searchSimilarVectors(queryVector, limit = 5, scoreThreshold = 0.7, filter = null, payloadFields = true) {
     if (!this.isAvailable()) {
       logger.warn('Qdrant not available for search');
       return [];
@@ -167,7 +233,7 @@ class QdrantService {
       const searchOptions = {
         vector: queryVector,
         limit: limit,
-        with_payload: true,
+        with_payload: payloadFields === true ? true : { include: payloadFields },
         score_threshold: scoreThreshold
       };
 
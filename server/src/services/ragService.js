@@ -1,13 +1,28 @@
+import { createHash } from 'crypto';
 import logger from '../utils/logger.js';
+import { withRetry } from '../utils/retry.js';
 import embeddingService from './embeddingService.js';
 import qdrantService from './qdrantService.js';
 import databaseService from './databaseService.js';
 
+const CHUNK_SIZE = parseInt(process.env.CHUNK_SIZE) || 1000;
+const CHUNK_OVERLAP = parseInt(process.env.CHUNK_OVERLAP) || 200;
+
+// Payload fields needed to build answers and sources; chunk payloads also
+// carry bulky extraction metadata (PDF info, DOCX messages) we don't need
+const SEARCH_PAYLOAD_FIELDS = ['content', 'documentId', 'chunkIndex', 'filename', 'documentType'];
+
+// Generated answers keyed by prompt hash; the same question against the same
+// retrieved context (or document fallback) gets the same answer without
+// another Gemini round-trip
+const RESPONSE_CACHE_MAX_SIZE = 200;
+
 class RAGService {
   constructor() {
     this.genAI = null;
     this.model = null;
     this.initialized = false;
+    this.responseCache = new Map();
     
     logger.info('RAGService created (not initialized yet)');
   }
@@ -63,51 +78,61 @@ class RAGService {
     try {
       logger.info(`Processing document ${documentId} for RAG`);
 
-      const chunks = embeddingService.chunkText(
-        content,
-        parseInt(process.env.CHUNK_SIZE) || 1000,
-        parseInt(process.env.CHUNK_OVERLAP) || 200
-      );
+      const chunks = embeddingService.chunkText(content, CHUNK_SIZE, CHUNK_OVERLAP);
 
       logger.info(`Generated ${chunks.length} chunks for document ${documentId}`);
 
-      const processedChunks = [];
+      // Embed all chunks up front with batched provider requests. If the
+      // whole call fails, every chunk is counted as failed below rather than
+      // failing the document
+      let embeddings;
+      try {
+        embeddings = await embeddingService.generateBatchEmbeddings(
+          chunks.map(chunk => chunk.text)
+        );
+      } catch (error) {
+        logger.error(`Failed to embed chunks for document ${documentId}:`, error);
+        embeddings = [];
+      }
+      
+      const vectors = [];
+      // One timestamp for the whole batch, so every chunk shares it
+      const createdAt = new Date().toISOString();
       
       for (let i = 0; i < chunks.length; i++) {
         const chunk = chunks[i];
+        const embeddingResult = embeddings[i];
         
-        try {
-          const embeddingResult = await embeddingService.generateEmbedding(chunk.text);
-          
-          const chunkData = {
-            id: `${documentId}_chunk_${i}`,
-            vector: embeddingResult.embedding,
-            metadata: {
-              documentId,
-              chunkIndex: i,
-              content: chunk.text,
-              startPosition: chunk.start,
-              endPosition: chunk.end,
-              ...metadata,
-              createdAt: new Date().toISOString()
-            }
-          };
-
-          await qdrantService.upsertVector(chunkData);
-          processedChunks.push(chunkData);
-          
-        } catch (error) {
-          logger.error(`Failed to process chunk ${i} for document ${documentId}:`, error);
+        if (!embeddingResult) {
+          logger.error(`Failed to process chunk ${i} for document ${documentId}: Embedding generation failed`);
+          continue;
         }
+        
+        vectors.push({
+          id: `${documentId}_chunk_${i}`,
+          vector: embeddingResult.embedding,
+          metadata: {
+            documentId,
+            chunkIndex: i,
+            content: chunk.text,
+            startPosition: chunk.start,
+            endPosition: chunk.end,
+            ...metadata,
+            createdAt
+          }
+        });
       }
 
-      logger.info(`Successfully processed ${processedChunks.length}/${chunks.length} chunks for document ${documentId}`);
+      // Store every chunk in a single upsert instead of one request per chunk
+      const processedCount = await qdrantService.upsertVectors(vectors);
+
+      logger.info(`Successfully processed ${processedCount}/${chunks.length} chunks for document ${documentId}`);
       
       return {
         documentId,
         totalChunks: chunks.length,
-        processedChunks: processedChunks.length,
-        failed: chunks.length - processedChunks.length
+        processedChunks: processedCount,
+        failed: chunks.length - processedCount
       };
 
     } catch (error) {
@@ -170,12 +195,13 @@ class RAGService {
       const searchResults = await qdrantService.searchSimilarVectors(
         queryEmbedding.embedding,
         searchOptions.topK,
-        searchOptions.minSimilarity || minSimilarity,
-        Object.keys(searchOptions.filter).length > 0 ? searchOptions.filter : null
+        minSimilarity,
+        Object.keys(searchOptions.filter).length > 0 ? searchOptions.filter : null,
+        SEARCH_PAYLOAD_FIELDS
       );
 
+      // Qdrant already applied score_threshold on cosine similarity
       const relevantChunks = searchResults
-        ?.filter(match => match.score >= minSimilarity)
         ?.map(match => ({
           content: match.metadata?.content || '',
           score: match.score,
@@ -282,12 +308,33 @@ Instructions:
 
 Answer:`;
 
+    const cacheKey = createHash('sha256').update(prompt).digest('base64');
+    const cached = this.responseCache.get(cacheKey);
+    if (cached !== undefined) {
+      // LRU: move the hit to the back of the Map's insertion order
+      this.responseCache.delete(cacheKey);
+      this.responseCache.set(cacheKey, cached);
+      return {
+        text: cached,
+        processingTime: Date.now() - startTime
+      };
+    }
+
     try {
-      const result = await this.model.generateContent(prompt);
+      const result = await withRetry(
+        () => this.model.generateContent(prompt),
+        { label: 'Gemini response generation' }
+      );
       const response = await result.response;
+      const text = response.text();
+
+      this.responseCache.set(cacheKey, text);
+      if (this.responseCache.size > RESPONSE_CACHE_MAX_SIZE) {
+        this.responseCache.delete(this.responseCache.keys().next().value);
+      }
       
       return {
-        text: response.text(),
+        text,
         processingTime: Date.now() - startTime
       };
     } catch (error) {
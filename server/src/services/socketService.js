@@ -1,10 +1,6 @@
-import winston from 'winston';
+import rootLogger from '../utils/logger.js';
 
-const logger = winston.createLogger({
-  level: 'info',
-  format: winston.format.json(),
-  defaultMeta: { service: 'socket-service' }
-});
+const logger = rootLogger.child({ module: 'socket-service' });
 
 // Store active connections
 const activeConnections = new Map();
@@ -1,5 +1,5 @@
 import { v4 as uuidv4 } from "uuid";
-import winston from "winston";
+import rootLogger from "../utils/logger.js";
 import fs from "fs/promises";
 import path from "path";
 import { fileURLToPath } from "url";
@@ -8,10 +8,36 @@ import databaseService from "./databaseService.js";
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-const logger = winston.createLogger({
-  level: "info",
-  format: winston.format.json(),
-  defaultMeta: { service: "speech" },
+const logger = rootLogger.child({ module: "speech" });
+
+// Files stat'ed/unlinked concurrently per chunk during audio cleanup
+const AUDIO_CLEANUP_BATCH_SIZE = 100;
+
+// Static capability listing served by the voice capability endpoints
+const SPEECH_CAPABILITIES = Object.freeze({
+  languages: [
+    { code: "en-US", name: "English (US)" },
+    { code: "en-GB", name: "English (UK)" },
+    { code: "es-ES", name: "Spanish (Spain)" },
+    { code: "fr-FR", name: "French (France)" },
+    { code: "de-DE", name: "German (Germany)" },
+    { code: "it-IT", name: "Italian (Italy)" },
+    { code: "pt-BR", name: "Portuguese (Brazil)" },
+    { code: "ja-JP", name: "Japanese (Japan)" },
+    { code: "ko-KR", name: "Korean (South Korea)" },
+    { code: "zh-CN", name: "Chinese (Simplified)" },
+  ],
+  voices: [
+    { name: "en-US-Neural2-D", language: "en-US", gender: "male" },
+    { name: "en-US-Neural2-F", language: "en-US", gender: "female" },
+    { name: "en-GB-Neural2-A", language: "en-GB", gender: "male" },
+    { name: "en-GB-Neural2-B", language: "en-GB", gender: "female" },
+    { name: "es-ES-Neural2-A", language: "es-ES", gender: "male" },
+    { name: "es-ES-Neural2-B", language: "es-ES", gender: "female" },
+  ],
+  formats: ["wav", "mp3", "m4a", "ogg"],
+  maxAudioDuration: 300, // 5 minutes
+  maxFileSize: 50 * 1024 * 1024, // 50MB
 });
 
 class SpeechService {
@@ -125,32 +151,19 @@ class SpeechService {
     try {
       const newSessionId = sessionId || uuidv4();
 
-      // Save audio file
-      const audioFile = await this.saveAudioFile(
-        audioBuffer,
-        "voice-query.wav",
-      );
-
-      // Transcribe audio
-      const transcription = await this.transcribeAudio(audioBuffer, language);
+      // Save and transcribe the audio concurrently; transcription only
+      // needs the buffer, not the file on disk
+      const [audioFile, transcription] = await Promise.all([
+        this.saveAudioFile(audioBuffer, "voice-query.wav"),
+        this.transcribeAudio(audioBuffer, language),
+      ]);
 
       // Get or create voice session
-      let voiceSession = await databaseService.getVoiceSession(
+      const voiceSession = await databaseService.getOrCreateVoiceSession(
+        uuidv4(),
         documentId,
         newSessionId,
       );
-      if (!voiceSession) {
-        const sessionData = {
-          id: uuidv4(),
-          documentId,
-          sessionId: newSessionId,
-        };
-        await databaseService.createVoiceSession(sessionData);
-        voiceSession = await databaseService.getVoiceSession(
-          documentId,
-          newSessionId,
-        );
-      }
 
       // Add transcription to session
       const transcriptions = voiceSession.transcriptions || [];
@@ -302,31 +315,7 @@ class SpeechService {
 
   // Get supported languages and voices
   getSupportedLanguages() {
-    return {
-      languages: [
-        { code: "en-US", name: "English (US)" },
-        { code: "en-GB", name: "English (UK)" },
-        { code: "es-ES", name: "Spanish (Spain)" },
-        { code: "fr-FR", name: "French (France)" },
-        { code: "de-DE", name: "German (Germany)" },
-        { code: "it-IT", name: "Italian (Italy)" },
-        { code: "pt-BR", name: "Portuguese (Brazil)" },
-        { code: "ja-JP", name: "Japanese (Japan)" },
-        { code: "ko-KR", name: "Korean (South Korea)" },
-        { code: "zh-CN", name: "Chinese (Simplified)" },
-      ],
-      voices: [
-        { name: "en-US-Neural2-D", language: "en-US", gender: "male" },
-        { name: "en-US-Neural2-F", language: "en-US", gender: "female" },
-        { name: "en-GB-Neural2-A", language: "en-GB", gender: "male" },
-        { name: "en-GB-Neural2-B", language: "en-GB", gender: "female" },
-        { name: "es-ES-Neural2-A", language: "es-ES", gender: "male" },
-        { name: "es-ES-Neural2-B", language: "es-ES", gender: "female" },
-      ],
-      formats: ["wav", "mp3", "m4a", "ogg"],
-      maxAudioDuration: 300, // 5 minutes
-      maxFileSize: 50 * 1024 * 1024, // 50MB
-    };
+    return SPEECH_CAPABILITIES;
   }
 
   // Clean up old audio files
@@ -334,16 +323,23 @@ class SpeechService {
     try {
       const files = await fs.readdir(this.audioDir);
       const cutoffTime = Date.now() - maxAgeHours * 60 * 60 * 1000;
-      let deletedCount = 0;
 
-      for (const file of files) {
-        const filePath = path.join(this.audioDir, file);
-        const stats = await fs.stat(filePath);
+      // Work through the directory in fixed-size chunks so a large backlog
+      // doesn't open thousands of file handles at once
+      let deletedCount = 0;
+      for (let i = 0; i < files.length; i += AUDIO_CLEANUP_BATCH_SIZE) {
+        const filePaths = files
+          .slice(i, i + AUDIO_CLEANUP_BATCH_SIZE)
+          .map((file) => path.join(this.audioDir, file));
+        const stats = await Promise.all(
+          filePaths.map((filePath) => fs.stat(filePath)),
+        );
+        const expired = filePaths.filter(
+          (filePath, j) => stats[j].mtime.getTime() < cutoffTime,
+        );
 
-        if (stats.mtime.getTime() < cutoffTime) {
-          await fs.unlink(filePath);
-          deletedCount++;
-        }
+        await Promise.all(expired.map((filePath) => fs.unlink(filePath)));
+        deletedCount += expired.length;
       }
 
       logger.info(`Cleaned up ${deletedCount} old audio files`);
@@ -1,4 +1,4 @@
-import winston from 'winston';
+import rootLogger from '../utils/logger.js';
 import { 
   transcribeAudio, 
   synthesizeSpeech, 
@@ -7,12 +7,60 @@ import {
 import { analyzeDocument } from './aiAnalyzer.js';
 import ragService from './ragService.js';
 
-const logger = winston.createLogger({
-  level: 'info',
-  format: winston.format.json(),
-  defaultMeta: { service: 'voice-service' }
+const logger = rootLogger.child({ module: 'voice-service' });
+
+// Spoken forms of abbreviations, built once rather than on every match
+const SPEECH_EXPANSIONS = {
+  'e.g.': 'for example',
+  'i.e.': 'that is',
+  'etc.': 'and so on'
+};
+
+// Query type keywords, checked in order (first match wins)
+const QUERY_TYPE_KEYWORDS = Object.entries({
+  termination: ['terminate', 'end', 'cancel', 'break'],
+  payment: ['pay', 'payment', 'cost', 'fee', 'money', 'amount'],
+  liability: ['liable', 'responsible', 'fault', 'damage'],
+  rights: ['right', 'can i', 'allowed', 'permitted'],
+  obligations: ['must', 'have to', 'required', 'obligation'],
+  timeline: ['when', 'deadline', 'due', 'time'],
+  general: ['what', 'how', 'why', 'explain']
 });
 
+// Suggested follow-up questions for each query type
+const FOLLOW_UP_QUESTIONS = {
+  termination: [
+    "How much notice is required for termination?",
+    "What are the consequences of early termination?",
+    "Can either party terminate without cause?"
+  ],
+  payment: [
+    "When are payments due?",
+    "What happens if I pay late?",
+    "Are there any additional fees?"
+  ],
+  liability: [
+    "What am I liable for under this agreement?",
+    "Are there any liability limitations?",
+    "What insurance requirements exist?"
+  ],
+  rights: [
+    "What are my main rights in this document?",
+    "Can I transfer my rights to someone else?",
+    "What happens if my rights are violated?"
+  ],
+  obligations: [
+    "What are my main obligations?",
+    "What happens if I don't fulfill my obligations?",
+    "Can I delegate my responsibilities?"
+  ],
+  general: [
+    "What are the key risks in this document?",
+    "Who are the parties involved?",
+    "What are the most important deadlines?"
+  ]
+};
+
 // Voice-powered document query system
 export class VoiceQuerySystem {
   constructor() {
@@ -178,7 +226,7 @@ ${conversationContext ? `Previous conversation:\n${conversationContext}\n\n` : '
 Please provide a clear, accurate answer based only on the document content provided. If the information is not available in the document, please say so clearly.`;
 
       // Generate AI response using Gemini
-      const model = getVertexAIModel('gemini-pro');
+      const model = await getVertexAIModel('gemini-pro');
       const result = await model.generateContent(prompt);
       const answer = result.response.text();
 
@@ -187,7 +235,7 @@ Please provide a clear, accurate answer based only on the document content provi
         confidence: sources[0]?.similarity || 0.8,
         sources: sources,
         relatedClauses: sources.map(s => s.content),
-        queryType: this.determineQueryType(queryText)
+        queryType: this.classifyQuery(queryText)
       };
 
     } catch (error) {
@@ -331,11 +379,12 @@ ANSWER:`;
   }
 
   // Utility functions
+  // Punctuation and whitespace together are exactly \W, so one pass
+  // collapses every run of them to a single space
   cleanTranscript(transcript) {
     return transcript
       .toLowerCase()
-      .replace(/[^\w\s]/g, ' ')
-      .replace(/\s+/g, ' ')
+      .replace(/\W+/g, ' ')
       .trim();
   }
 
@@ -343,12 +392,7 @@ ANSWER:`;
     return text
       .replace(/([.!?])\s*([A-Z])/g, '$1 $2') // Add pause after sentences
       .replace(/\b(e\.g\.|i\.e\.|etc\.)\b/g, (match) => {
-        const expansions = {
-          'e.g.': 'for example',
-          'i.e.': 'that is',
-          'etc.': 'and so on'
-        };
-        return expansions[match.toLowerCase()] || match;
+        return SPEECH_EXPANSIONS[match.toLowerCase()] || match;
       })
       .replace(/\$(\d+(?:,\d{3})*(?:\.\d{2})?)/g, '$1 dollars') // Format currency
       .replace(/(\d+)%/g, '$1 percent') // Format percentages
@@ -364,7 +408,10 @@ ANSWER:`;
 
   findRelatedClauses(query, analysis) {
     const queryWords = query.toLowerCase().split(/\s+/);
-    const relatedClauses = [];
+    const limit = 3;
+    // Keep only the best `limit` matches (ties keep document order) instead
+    // of copying and sorting every matching clause
+    const top = [];
 
     analysis.clauses.forEach(clause => {
       const clauseText = clause.summary.toLowerCase();
@@ -372,17 +419,19 @@ ANSWER:`;
         return score + (clauseText.includes(word) ? 1 : 0);
       }, 0);
 
-      if (matchScore > 0) {
-        relatedClauses.push({
-          ...clause,
-          relevanceScore: matchScore / queryWords.length
-        });
-      }
+      if (matchScore === 0) return;
+      if (top.length === limit && matchScore <= top[limit - 1].matchScore) return;
+
+      let i = top.length;
+      while (i > 0 && top[i - 1].matchScore < matchScore) i--;
+      top.splice(i, 0, { clause, matchScore });
+      if (top.length > limit) top.pop();
     });
 
-    return relatedClauses
-      .sort((a, b) => b.relevanceScore - a.relevanceScore)
-      .slice(0, 3);
+    return top.map(({ clause, matchScore }) => ({
+      ...clause,
+      relevanceScore: matchScore / queryWords.length
+    }));
   }
 
   extractSources(responseText, documentContext) {
@@ -406,18 +455,8 @@ ANSWER:`;
 
   classifyQuery(query) {
     const queryLower = query.toLowerCase();
-    
-    const patterns = {
-      termination: ['terminate', 'end', 'cancel', 'break'],
-      payment: ['pay', 'payment', 'cost', 'fee', 'money', 'amount'],
-      liability: ['liable', 'responsible', 'fault', 'damage'],
-      rights: ['right', 'can i', 'allowed', 'permitted'],
-      obligations: ['must', 'have to', 'required', 'obligation'],
-      timeline: ['when', 'deadline', 'due', 'time'],
-      general: ['what', 'how', 'why', 'explain']
-    };
 
-    for (const [type, keywords] of Object.entries(patterns)) {
+    for (const [type, keywords] of QUERY_TYPE_KEYWORDS) {
       if (keywords.some(keyword => queryLower.includes(keyword))) {
         return type;
       }
@@ -426,43 +465,10 @@ ANSWER:`;
     return 'general';
   }
 
+  // Returns a fresh array so callers can't mutate the shared table
   generateFollowUpQuestions(query, documentId) {
     const queryType = this.classifyQuery(query);
-    
-    const suggestions = {
-      termination: [
-        "How much notice is required for termination?",
-        "What are the consequences of early termination?",
-        "Can either party terminate without cause?"
-      ],
-      payment: [
-        "When are payments due?",
-        "What happens if I pay late?",
-        "Are there any additional fees?"
-      ],
-      liability: [
-        "What am I liable for under this agreement?",
-        "Are there any liability limitations?",
-        "What insurance requirements exist?"
-      ],
-      rights: [
-        "What are my main rights in this document?",
-        "Can I transfer my rights to someone else?",
-        "What happens if my rights are violated?"
-      ],
-      obligations: [
-        "What are my main obligations?",
-        "What happens if I don't fulfill my obligations?",
-        "Can I delegate my responsibilities?"
-      ],
-      general: [
-        "What are the key risks in this document?",
-        "Who are the parties involved?",
-        "What are the most important deadlines?"
-      ]
-    };
-
-    return suggestions[queryType] || suggestions.general;
+    return [...(FOLLOW_UP_QUESTIONS[queryType] || FOLLOW_UP_QUESTIONS.general)];
   }
 
   // Get system statistics
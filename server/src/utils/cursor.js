@@ -0,0 +1,22 @@
+// Opaque keyset cursors. A cursor carries the (created_at, id) position of
+// the last record on a page, so the next page can be found even if that
+// record has since been deleted.
+
+const ISO_TIMESTAMP = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$/;
+const UUID = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+export function encodeCursor(record) {
+  return Buffer.from(`${record.created_at}|${record.id}`).toString('base64url');
+}
+
+// Returns { createdAt, id }, or null if the value isn't a cursor we issued
+export function decodeCursor(cursor) {
+  const [createdAt, id, ...rest] = Buffer.from(String(cursor), 'base64url')
+    .toString('utf8')
+    .split('|');
+
+  if (rest.length > 0 || !ISO_TIMESTAMP.test(createdAt) || !UUID.test(id)) {
+    return null;
+  }
+  return { createdAt, id };
+}
@@ -0,0 +1,13 @@
+import dotenv from 'dotenv';
+import { fileURLToPath } from 'url';
+import { dirname, join } from 'path';
+
+// Load .env from server root directory.
+// ES module imports are evaluated before the importing module's body, so this
+// must be the first import in index.js for other modules to see the values
+// when they read process.env at load time.
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+export const envPath = join(__dirname, '..', '..', '.env');
+export const envResult = dotenv.config({ path: envPath });
@@ -0,0 +1,59 @@
+import logger from './logger.js';
+
+const DEFAULT_MAX_ATTEMPTS = 3;
+const DEFAULT_BASE_DELAY_MS = 1000;
+const DEFAULT_MAX_DELAY_MS = 60000;
+
+// Rate limiting (429) and overload (503) are transient; anything else is not.
+// SDKs differ: OpenAI errors carry `status`, older Gemini SDK errors only
+// mention the status code in the message ("[429 Too Many Requests] ...").
+// Errors rethrown with context keep the SDK error as their cause.
+export function isRetryableError(error) {
+  const status = error?.status ?? error?.response?.status;
+  if (status === 429 || status === 503) {
+    return true;
+  }
+  if (/\[(429|503)\b/.test(error?.message || '')) {
+    return true;
+  }
+  return error?.cause ? isRetryableError(error.cause) : false;
+}
+
+function getRetryAfterMs(error) {
+  const headers = error?.headers;
+  const value = typeof headers?.get === 'function'
+    ? headers.get('retry-after')
+    : headers?.['retry-after'];
+  const seconds = parseFloat(value);
+  return Number.isFinite(seconds) ? seconds * 1000 : null;
+}
+
+// Calls fn, retrying retryable failures with exponential backoff plus random
+// jitter (or the server's Retry-After when it sends one)
+export async function withRetry(fn, options = {}) {
+  const {
+    label = 'request',
+    maxAttempts = DEFAULT_MAX_ATTEMPTS,
+    baseDelayMs = DEFAULT_BASE_DELAY_MS,
+    maxDelayMs = DEFAULT_MAX_DELAY_MS
+  } = options;
+
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await fn();
+    } catch (error) {
+      if (attempt >= maxAttempts || !isRetryableError(error)) {
+        throw error;
+      }
+
+      const backoff = baseDelayMs * 2 ** (attempt - 1);
+      const delay = Math.min(
+        maxDelayMs,
+        getRetryAfterMs(error) ?? backoff + Math.random() * backoff
+      );
+
+      logger.warn(`${label} failed (attempt ${attempt}/${maxAttempts}), retrying in ${Math.round(delay)}ms: ${error.message}`);
+      await new Promise(resolve => setTimeout(resolve, delay));
+    }
+  }
+}